@@ -4,9 +4,73 @@ Canvas Editor for LVGL widgets
 
 import tkinter as tk
 from tkinter import ttk
-from typing import Dict, List, Any, Optional, Tuple, Callable
-import copy
-from widgets import LVGLWidget, create_widget, LVGL_WIDGETS
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterable
+import functools
+import math
+import os
+import re
+from collections import OrderedDict
+from operator import attrgetter
+from widgets import LVGLWidget, create_widget, SIZE_CONTENT, WIDGET_INFO, WIDGET_DEFAULT_SIZES, DEFAULT_WIDGET_SIZE
+from canvas_items import CanvasItemCache
+from spatial_index import RTree
+
+# Delay after the last zoom step before the canvas is redrawn at the new zoom
+_ZOOM_SETTLE_MS = 150
+
+# Control key bit of event.state
+_CTRL_MASK = 0x4
+
+# Numbered widget ids as given out by new_widget_id
+_NUMBERED_ID = re.compile(r'(.+)_(\d+)$')
+
+# Widget-specific default colors, used while a widget keeps the black default
+_WIDGET_DEFAULTS = {
+    'button': {'bg_color': '#4CAF50', 'border_color': '#2E7D32'},
+    'label': {'bg_color': 'transparent', 'border_color': 'transparent'},
+    'image': {'bg_color': '#F5F5F5', 'border_color': '#E0E0E0'},
+    'slider': {'bg_color': 'transparent', 'border_color': 'transparent'},
+    'switch': {'bg_color': 'transparent', 'border_color': 'transparent'},
+    'checkbox': {'bg_color': 'transparent', 'border_color': 'transparent'},
+    'arc': {'bg_color': 'transparent', 'border_color': 'transparent'},
+    'bar': {'bg_color': '#EEEEEE', 'border_color': '#CCCCCC'},
+    'dropdown': {'bg_color': 'white', 'border_color': '#CCCCCC'},
+    'textarea': {'bg_color': 'white', 'border_color': '#CCCCCC'},
+    'led': {'bg_color': 'transparent', 'border_color': 'transparent'},
+}
+_DEFAULT_COLORS = {'bg_color': '#424242', 'border_color': '#616161'}
+
+# Number of decoded and resized images kept by load_image
+_IMAGE_CACHE_SIZE = 64
+_SOURCE_IMAGE_CACHE_SIZE = 16
+
+# Number of pre-rendered LED, switch and checkbox sprites kept by get_sprite
+_SPRITE_CACHE_SIZE = 128
+_SPRITE_SUPERSAMPLE = 4
+
+# Named colors understood by parse_color
+_NAMED_COLORS = {
+    'red': '#FF0000', 'green': '#00FF00', 'blue': '#0000FF',
+    'white': '#FFFFFF', 'black': '#000000', 'gray': '#808080',
+    'yellow': '#FFFF00', 'cyan': '#00FFFF', 'magenta': '#FF00FF'
+}
+
+# Unit shapes as flat (x, y, ...) tuples, scaled by the shape size when drawn
+_CHECK_UNIT = (0.2, 0.5, 0.45, 0.7, 0.8, 0.3)  # Checkbox checkmark, from the box corner
+_ARROW_UNIT = (0, -0.5, 1, -0.5, 0.5, 0.5)  # Dropdown arrow, from its left middle
+_MOUNTAIN_UNIT = (-0.5, 0.25, -0.25, -0.25, 0, 0, 0.25, -0.25, 0.5, 0.25)  # Image icon, from its center
+
+
+@functools.lru_cache(maxsize=256)
+def _scaled_shape(unit: Tuple[float, ...], size: float) -> Tuple[float, ...]:
+    """Scale a unit shape to whole pixel offsets, rounded toward the origin"""
+    return tuple(math.copysign(abs(u) * size // 1, u) for u in unit)
+
+
+def _place_shape(offsets: Tuple[float, ...], x: float, y: float) -> List[float]:
+    """Move scaled shape offsets to an origin point"""
+    return [value + (x if i % 2 == 0 else y) for i, value in enumerate(offsets)]
+
 
 class CanvasEditor:
     """Canvas editor for visual widget editing"""
@@ -18,14 +82,18 @@ class CanvasEditor:
         self.change_callback = change_callback
         
         # State
-        self.widgets = {}  # page_id -> List[LVGLWidget]
+        self.widgets: Dict[str, OrderedDict] = {}  # page_id -> OrderedDict[widget id, LVGLWidget], in z-order
         self.current_page = "main_page"
-        self.selected_widgets = []
+        self.selected_widgets: Dict[str, LVGLWidget] = {}  # widget id -> selected widget, in selection order
         self.placing_widget = None
         self.zoom_level = 1.0
+        self._inv_zoom = 1.0  # 1 / zoom_level, kept by set_zoom and update_zoom_display
+        self._zoom_after = None  # pending _finalize_zoom callback
         self.grid_visible = True
         self.snap_to_grid = True
         self.grid_size = 10
+        self._grid_mask = None
+        self._grid_half = 0
         
         # Clipboard
         self.clipboard = []
@@ -33,12 +101,52 @@ class CanvasEditor:
         # Drag state
         self.drag_start = None
         self.drag_widgets = []
+        self._drag_indices = []  # (index in page, widget, start x, start y) of dragged widgets
+        
+        # Widget geometry per page in display units, parallel to the page widget order
+        self._page_geom: Dict[str, Dict[str, Any]] = {}  # page_id -> {'id', 'x', 'y', 'w', 'h', 'index', 'tree'}
+        self._scaled_cache: Dict[str, Tuple[tuple, List[Tuple[float, float, float, float]]]] = {}  # page_id -> (transform, canvas rects)
+        self._id_counters: Dict[Tuple[str, str], int] = {}  # (page_id, widget type) -> next id number
+        
+        # Canvas items kept between redraws
+        self._display_item = None
+        self._grid_items = []
+        self._grid_key = None
+        self._image_cache = OrderedDict()  # (path, mtime, width, height) -> ImageTk.PhotoImage, LRU order
+        self._source_image_cache = OrderedDict()  # (path, mtime) -> decoded PIL image, LRU order
+        self._sprite_cache = OrderedDict()  # (widget type, state, sizes...) -> ImageTk.PhotoImage, LRU order
+        self._dirty: Dict[int, LVGLWidget] = {}  # id(widget) -> widget waiting for flush()
+        self._selection_items: Dict[int, Tuple[int, int, int, int, int]] = {}  # id(widget) -> (outline, tl, tr, bl, br)
+        
+        # Redraw scheduling
+        self._redraw_pending = False
+        self._full_redraw_pending = False
+        self._dirty_regions: List[Tuple[float, float, float, float]] = []  # canvas regions to redraw, merged
+        
+        # Viewport culling
+        self._view_rect = None
+        self._hidden_widgets = set()  # id(widget) of widgets with hidden items
+        
+        # Content drawing per widget type
+        self._draw_dispatch: Dict[str, Callable] = {
+            'label': self._draw_label,
+            'button': self._draw_button,
+            'image': self._draw_image,
+            'slider': self._draw_slider,
+            'switch': self._draw_switch,
+            'checkbox': self._draw_checkbox,
+            'arc': self._draw_arc,
+            'bar': self._draw_bar,
+            'dropdown': self._draw_dropdown,
+            'textarea': self._draw_textarea,
+            'led': self._draw_led,
+        }
         
         # Create UI
         self.create_ui()
         
         # Initialize with empty page
-        self.widgets[self.current_page] = []
+        self.widgets[self.current_page] = OrderedDict()
         
     def create_ui(self):
         """Create the canvas UI"""
@@ -69,6 +177,13 @@ class CanvasEditor:
         self.snap_var = tk.BooleanVar(value=self.snap_to_grid)
         ttk.Checkbutton(toolbar, text="Snap", variable=self.snap_var, command=self.toggle_snap).pack(side=tk.LEFT, padx=5)
         
+        ttk.Label(toolbar, text="Size:").pack(side=tk.LEFT, padx=(5, 2))
+        self.grid_size_var = tk.StringVar(value=str(self.grid_size))
+        grid_size_combo = ttk.Combobox(toolbar, textvariable=self.grid_size_var, width=4, state="readonly",
+                                       values=["4", "5", "8", "10", "16", "20", "32"])
+        grid_size_combo.pack(side=tk.LEFT)
+        grid_size_combo.bind("<<ComboboxSelected>>", lambda e: self.set_grid_size(int(self.grid_size_var.get())))
+        
         # Canvas frame with scrollbars
         canvas_frame = ttk.Frame(main_frame)
         canvas_frame.pack(fill=tk.BOTH, expand=True)
@@ -80,12 +195,17 @@ class CanvasEditor:
         v_scrollbar = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=self.canvas.yview)
         h_scrollbar = ttk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
         
-        self.canvas.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        # Scrolling and resizing change the visible part, redraw to update culling
+        self.canvas.configure(
+            yscrollcommand=lambda *args: self._on_view_changed(v_scrollbar, *args),
+            xscrollcommand=lambda *args: self._on_view_changed(h_scrollbar, *args)
+        )
         
         # Pack scrollbars and canvas
         v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._widget_items = CanvasItemCache(self.canvas)
         
         # Bind events
         self.canvas.bind("<Button-1>", self.on_canvas_click)
@@ -96,6 +216,7 @@ class CanvasEditor:
         self.canvas.bind("<Delete>", lambda e: self.delete_selected())
         self.canvas.bind("<Control-c>", lambda e: self.copy_selected())
         self.canvas.bind("<Control-v>", lambda e: self.paste())
+        self.create_context_menus()
         
         # Make canvas focusable
         self.canvas.focus_set()
@@ -122,91 +243,360 @@ class CanvasEditor:
         self.display_width = display_width
         self.display_height = display_height
         
+        self._recompute_zoom_constants()
+        
+    def _recompute_zoom_constants(self):
+        """Compute the zoom dependent sizes used while drawing widget content"""
+        zoom = self.zoom_level
+        self._text_size = max(8, int(12 * zoom))
+        self._shadow_offset = max(1, int(2 * zoom))
+        self._track_height = max(4, int(6 * zoom))
+        self._slider_margin = int(10 * zoom)
+        self._knob_size = max(12, int(16 * zoom))
+        self._switch_width = int(50 * zoom)
+        self._switch_height = int(25 * zoom)
+        self._check_size = int(20 * zoom)
+        self._check_line_width = max(2, int(3 * zoom))
+        self._arc_margin = max(3, int(5 * zoom))
+        self._arc_width = max(3, int(6 * zoom))
+        self._bar_margin = max(2, int(3 * zoom))
+        self._arrow_size = max(6, int(8 * zoom))
+        
     def draw_display(self):
         """Draw the display area and contents"""
-        self.canvas.delete("all")
-        
-        # Draw display background
-        self.canvas.create_rectangle(
+        # Draw display background, reusing the item of the previous redraw
+        display_coords = (
             self.display_x, self.display_y,
-            self.display_x + self.display_width, 
-            self.display_y + self.display_height,
-            fill='black', outline='gray', width=2, tags="display"
+            self.display_x + self.display_width,
+            self.display_y + self.display_height
         )
+        if self._display_item is None:
+            self._display_item = self.canvas.create_rectangle(
+                *display_coords,
+                fill='black', outline='gray', width=2, tags="display"
+            )
+            self.canvas.tag_lower(self._display_item)
+        else:
+            self.canvas.coords(self._display_item, *display_coords)
         
         # Draw grid
-        if self.grid_visible:
-            self.draw_grid()
+        self.draw_grid()
             
         # Draw widgets
         self.draw_widgets()
         
     def draw_grid(self):
         """Draw grid on the display"""
-        grid_spacing = int(self.grid_size * self.zoom_level)
-        
-        # Vertical lines
-        x = self.display_x
-        while x <= self.display_x + self.display_width:
-            self.canvas.create_line(
-                x, self.display_y, x, self.display_y + self.display_height,
-                fill='#333333', width=1, tags="grid"
-            )
-            x += grid_spacing
+        # Grid lines only change with zoom, grid size or display size
+        grid_key = (self.grid_visible, self.grid_size, self.zoom_level,
+                    self.display_x, self.display_y, self.display_width, self.display_height)
+        if grid_key == self._grid_key:
+            return
+        self._grid_key = grid_key
+        
+        if self._grid_items:
+            self.canvas.delete("grid")
+            self._grid_items = []
             
-        # Horizontal lines
-        y = self.display_y
-        while y <= self.display_y + self.display_height:
-            self.canvas.create_line(
-                self.display_x, y, self.display_x + self.display_width, y,
-                fill='#333333', width=1, tags="grid"
-            )
-            y += grid_spacing
+        if not self.grid_visible:
+            return
+            
+        grid_spacing = max(1, int(self.grid_size * self.zoom_level))
+        left, top = self.display_x, self.display_y
+        right, bottom = left + self.display_width, top + self.display_height
+        
+        # All lines of an axis form one zig-zag path, going back along the
+        # first line (top or left edge) which is a grid line anyway
+        v_points = []
+        for x in range(left, right + 1, grid_spacing):
+            v_points += [x, top, x, bottom, x, top]
+        h_points = []
+        for y in range(top, bottom + 1, grid_spacing):
+            h_points += [left, y, right, y, left, y]
+            
+        for points in (v_points, h_points):
+            self._grid_items.append(self.canvas.create_line(
+                *points, fill='#333333', width=1, tags="grid"
+            ))
+            
+        # Keep the grid between display background and widgets
+        self.canvas.tag_raise("grid", self._display_item)
             
     def draw_widgets(self):
         """Draw all widgets on the current page"""
-        if self.current_page not in self.widgets:
+        page_widgets = list(self.widgets.get(self.current_page, {}).values())
+        
+        # Remove items of widgets that are no longer on the page
+        # (items are keyed by the widget object, ids may be renamed or duplicated)
+        page_keys = {id(widget) for widget in page_widgets}
+        for key in self._widget_items.owners():
+            if key not in page_keys:
+                self._widget_items.discard(key)
+        for key in list(self._selection_items):
+            if key not in page_keys:
+                self.canvas.delete(*self._selection_items.pop(key))
+        self._hidden_widgets &= page_keys
+        drawn_keys = set(self._widget_items.owners())
+        self._dirty.clear()
+        self._dirty_regions = []
+        self._view_rect = self.visible_rect()
+        
+        # New items are created on top, restack if they ended up above existing ones
+        restack = False
+        created_below = False
+        rects = self.scaled_geometry(self.current_page)
+        for widget, rect in zip(page_widgets, rects):
+            if created_below and id(widget) in drawn_keys:
+                restack = True
+            if self.redraw_widget(widget, rect):
+                created_below = True
+                
+        if restack:
+            for widget in page_widgets:
+                self._widget_items.raise_owner(id(widget))
+        if created_below:
+            self.raise_selection()
+                
+    def mark_dirty(self, widget: LVGLWidget):
+        """Mark a widget to be redrawn by the next flush()"""
+        self._dirty[id(widget)] = widget
+        
+    def mark_selection_dirty(self):
+        """Mark all selected widgets to be redrawn"""
+        for widget in self.get_selected_widgets():
+            self.mark_dirty(widget)
+            
+    def get_selected_widgets(self) -> List[LVGLWidget]:
+        """Get the selected widgets in selection order"""
+        return list(self.selected_widgets.values())
+            
+    def invalidate_rect(self, rect: Tuple[float, float, float, float]):
+        """Schedule a redraw of the widgets intersecting a canvas region"""
+        self.invalidate_regions([rect])
+        
+    def invalidate_regions(self, rects: List[Tuple[float, float, float, float]]):
+        """Schedule a redraw of the widgets intersecting any of several canvas regions"""
+        # Sweep the regions top to bottom, merging each into the last one it overlaps
+        merged = []
+        for rect in sorted(self._dirty_regions + list(rects), key=lambda rect: (rect[1], rect[0])):
+            if merged:
+                x0, y0, x1, y1 = merged[-1]
+                if rect[1] <= y1 and rect[0] <= x1 and rect[2] >= x0:
+                    merged[-1] = (min(x0, rect[0]), y0, max(x1, rect[2]), max(y1, rect[3]))
+                    continue
+            merged.append(rect)
+        self._dirty_regions = merged
+        if merged:
+            self._request_redraw()
+        
+    def mark_regions_dirty(self):
+        """Mark the widgets intersecting the dirty regions for the next flush()"""
+        regions, self._dirty_regions = self._dirty_regions, []
+        
+        # Query the spatial index in display units
+        inv_zoom = self._inv_zoom
+        display_x, display_y = self.display_x, self.display_y
+        tree = self.page_tree(self.current_page)
+        hits = set()
+        for x0, y0, x1, y1 in regions:
+            hits.update(tree.query_rect((x0 - display_x) * inv_zoom, (y0 - display_y) * inv_zoom,
+                                        (x1 - display_x) * inv_zoom, (y1 - display_y) * inv_zoom))
+        page = self.widgets.get(self.current_page, {})
+        ids = self.page_geometry(self.current_page)['id']
+        for i in sorted(hits):
+            self.mark_dirty(page[ids[i]])
+            
+    def flush(self):
+        """Redraw only the widgets marked dirty"""
+        if self._dirty_regions:
+            self.mark_regions_dirty()
+        if not self._dirty:
             return
-            
-        for widget in self.widgets[self.current_page]:
-            self.draw_widget(widget)
-            
-    def draw_widget(self, widget: LVGLWidget):
-        """Draw a single widget"""
-        # Calculate position and size
-        x = self.display_x + (widget.x * self.zoom_level)
-        y = self.display_y + (widget.y * self.zoom_level)
-        
-        # Get size from widget config or default
-        widget_info = self.get_widget_info(widget.widget_type)
-        default_width, default_height = widget_info.get('default_size', (100, 30))
-        
-        if isinstance(widget.width, str) and widget.width == "SIZE_CONTENT":
-            width = default_width * self.zoom_level
+        dirty, self._dirty = self._dirty, {}
+        self._view_rect = self.visible_rect()
+        
+        created = False
+        for widget in dirty.values():
+            if self.redraw_widget(widget):
+                self.restack_widget(widget)
+                created = True
+        if created:
+            self.raise_selection()
+                
+    def _request_redraw(self, full: bool = False):
+        """Schedule a redraw for the next idle cycle, repeated requests are coalesced"""
+        if full:
+            self._full_redraw_pending = True
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.canvas.after_idle(self._do_redraw)
+            
+    def _do_redraw(self):
+        """Run the scheduled redraw"""
+        self._redraw_pending = False
+        if self._full_redraw_pending:
+            self._full_redraw_pending = False
+            self.draw_display()
+        else:
+            self.flush()
+            
+    def _on_view_changed(self, scrollbar: ttk.Scrollbar, *args):
+        """Update a scrollbar and redraw widgets that came into view"""
+        scrollbar.set(*args)
+        view_rect = self.visible_rect()
+        if view_rect is None:
+            self._request_redraw(full=True)
         else:
-            width = widget.width * self.zoom_level
+            self.invalidate_rect(view_rect)
+        
+    def visible_rect(self) -> Optional[Tuple[float, float, float, float]]:
+        """Get the visible canvas region, None while the canvas isn't mapped yet"""
+        view_width = self.canvas.winfo_width()
+        view_height = self.canvas.winfo_height()
+        if view_width <= 1 or view_height <= 1:
+            return None
+        x0 = self.canvas.canvasx(0)
+        y0 = self.canvas.canvasy(0)
+        return (x0, y0, x0 + view_width, y0 + view_height)
+        
+    def redraw_widget(self, widget: LVGLWidget, rect: Optional[Tuple[float, float, float, float]] = None) -> bool:
+        """Update the canvas items of one widget, returns True if items were created"""
+        key = id(widget)
+        if rect is None:
+            rect = self.widget_canvas_rect(widget)
+        
+        # Skip widgets outside the visible region, hide their items instead of deleting them
+        if self._view_rect is not None:
+            x, y, width, height = rect
+            view_x0, view_y0, view_x1, view_y1 = self._view_rect
+            if x > view_x1 or y > view_y1 or x + width < view_x0 or y + height < view_y0:
+                if key not in self._hidden_widgets:
+                    self._hidden_widgets.add(key)
+                    for item in self._widget_items.item_ids(key):
+                        self.canvas.itemconfigure(item, state='hidden')
+                    self.remove_selection_items(widget)
+                return False
+                
+        if key in self._hidden_widgets:
+            self._hidden_widgets.discard(key)
+            for item in self._widget_items.item_ids(key):
+                self.canvas.itemconfigure(item, state='normal')
+                
+        self._widget_items.begin(key)
+        self.draw_widget(widget, rect)
+        self._widget_items.end()
+        return self._widget_items.created
+        
+    def restack_widget(self, widget: LVGLWidget):
+        """Move the items of a widget right above the widget below it"""
+        page = self.widgets.get(self.current_page, {})
+        if page.get(widget.id) is not widget:
+            # Not on the current page (anymore)
+            self._widget_items.discard(id(widget))
+            return
             
-        if isinstance(widget.height, str) and widget.height == "SIZE_CONTENT":
-            height = default_height * self.zoom_level
+        anchor = None
+        below = reversed(page.values())
+        for other in below:
+            if other is widget:
+                break
+        for other in below:
+            below_items = self._widget_items.item_ids(id(other))
+            if below_items:
+                anchor = below_items[-1]
+                break
+        self._widget_items.raise_owner(id(widget), above=anchor or self.bottom_anchor())
+        
+    def bottom_anchor(self) -> int:
+        """Get the topmost non-widget item, widgets are stacked above it"""
+        return self._grid_items[-1] if self._grid_items else self._display_item
+            
+    def widget_size(self, widget: LVGLWidget) -> Tuple[float, float]:
+        """Get width and height of a widget in display units"""
+        width, height = widget.width, widget.height
+        
+        # Get size from widget config or default (SIZE_CONTENT is negative)
+        if width < 0 or height < 0:
+            default_width, default_height = WIDGET_DEFAULT_SIZES.get(widget.widget_type, DEFAULT_WIDGET_SIZE)
+            if width < 0:
+                width = default_width
+            if height < 0:
+                height = default_height
+                
+        return width, height
+        
+    def widget_canvas_rect(self, widget: LVGLWidget) -> Tuple[float, float, float, float]:
+        """Get x, y, width and height of a widget in canvas coordinates"""
+        zoom = self.zoom_level
+        width, height = self.widget_size(widget)
+        return (self.display_x + widget.x * zoom, self.display_y + widget.y * zoom,
+                width * zoom, height * zoom)
+        
+    def page_geometry(self, page_id: str) -> Dict[str, Any]:
+        """Get the geometry lists of a page, rebuilt after structural changes"""
+        geom = self._page_geom.get(page_id)
+        if geom is None:
+            # Collect each attribute in one C level pass over the widgets
+            widgets = list(self.widgets.get(page_id, {}).values())
+            ids = list(map(attrgetter('id'), widgets))
+            ws = list(map(attrgetter('width'), widgets))
+            hs = list(map(attrgetter('height'), widgets))
+            
+            # Resolve SIZE_CONTENT (negative) sizes to the widget type defaults
+            for i in [i for i, (width, height) in enumerate(zip(ws, hs)) if width < 0 or height < 0]:
+                ws[i], hs[i] = self.widget_size(widgets[i])
+                
+            geom = {
+                'id': ids,
+                'x': list(map(attrgetter('x'), widgets)),
+                'y': list(map(attrgetter('y'), widgets)),
+                'w': ws,
+                'h': hs,
+                'index': dict(zip(ids, range(len(ids)))),
+            }
+            self._page_geom[page_id] = geom
+        return geom
+        
+    def page_tree(self, page_id: str) -> RTree:
+        """Get the spatial index of a page's widgets, built from the page geometry when needed"""
+        geom = self.page_geometry(page_id)
+        tree = geom.get('tree')
+        if tree is None:
+            tree = geom['tree'] = RTree(geom['x'], geom['y'], geom['w'], geom['h'])
+        return tree
+        
+    def scaled_geometry(self, page_id: str) -> List[Tuple[float, float, float, float]]:
+        """Get the canvas rectangles of a page's widgets, cached until zoom or geometry change"""
+        transform = (self.zoom_level, self.display_x, self.display_y)
+        cached = self._scaled_cache.get(page_id)
+        if cached is not None and cached[0] == transform:
+            return cached[1]
+            
+        zoom, offset_x, offset_y = transform
+        geom = self.page_geometry(page_id)
+        rects = [
+            (offset_x + x * zoom, offset_y + y * zoom, w * zoom, h * zoom)
+            for x, y, w, h in zip(geom['x'], geom['y'], geom['w'], geom['h'])
+        ]
+        self._scaled_cache[page_id] = (transform, rects)
+        return rects
+        
+    def invalidate_geometry(self, page_id: Optional[str] = None):
+        """Drop cached geometry of a page (or all pages) after widgets changed"""
+        if page_id is None:
+            self._page_geom.clear()
+            self._scaled_cache.clear()
         else:
-            height = widget.height * self.zoom_level
+            self._page_geom.pop(page_id, None)
+            self._scaled_cache.pop(page_id, None)
+        
+    def draw_widget(self, widget: LVGLWidget, rect: Optional[Tuple[float, float, float, float]] = None):
+        """Draw a single widget"""
+        # Calculate position and size unless the caller has it already
+        x, y, width, height = rect if rect is not None else self.widget_canvas_rect(widget)
             
         # Determine colors with widget-specific defaults
-        widget_defaults = {
-            'button': {'bg_color': '#4CAF50', 'border_color': '#2E7D32'},
-            'label': {'bg_color': 'transparent', 'border_color': 'transparent'},
-            'image': {'bg_color': '#F5F5F5', 'border_color': '#E0E0E0'},
-            'slider': {'bg_color': 'transparent', 'border_color': 'transparent'},
-            'switch': {'bg_color': 'transparent', 'border_color': 'transparent'},
-            'checkbox': {'bg_color': 'transparent', 'border_color': 'transparent'},
-            'arc': {'bg_color': 'transparent', 'border_color': 'transparent'},
-            'bar': {'bg_color': '#EEEEEE', 'border_color': '#CCCCCC'},
-            'dropdown': {'bg_color': 'white', 'border_color': '#CCCCCC'},
-            'textarea': {'bg_color': 'white', 'border_color': '#CCCCCC'},
-            'led': {'bg_color': 'transparent', 'border_color': 'transparent'},
-        }
-        
-        defaults = widget_defaults.get(widget.widget_type, {'bg_color': '#424242', 'border_color': '#616161'})
+        defaults = _WIDGET_DEFAULTS.get(widget.widget_type, _DEFAULT_COLORS)
         
         # Use widget color or default
         bg_color = widget.bg_color if widget.bg_color != '#000000' else defaults['bg_color']
@@ -219,7 +609,7 @@ class CanvasEditor:
         if bg_color != 'transparent':
             # Create widget rectangle
             outline_width = max(1, int(widget.border_width * self.zoom_level)) if border_color != 'transparent' else 0
-            widget_id = self.canvas.create_rectangle(
+            widget_id = self._widget_items.create_rectangle(
                 x, y, x + width, y + height,
                 fill=bg_color, outline=border_color, width=outline_width,
                 tags=f"widget_{widget.id}"
@@ -229,425 +619,477 @@ class CanvasEditor:
         self.draw_widget_content(widget, x, y, width, height)
         
         # Highlight if selected
-        if widget in self.selected_widgets:
-            self.canvas.create_rectangle(
-                x - 2, y - 2, x + width + 2, y + height + 2,
-                fill='', outline='blue', width=2, tags=f"selection_{widget.id}"
+        if widget.id in self.selected_widgets:
+            self.update_selection_items(widget, x, y, width, height)
+        else:
+            self.remove_selection_items(widget)
+            
+    def update_selection_items(self, widget: LVGLWidget, x: float, y: float, width: float, height: float):
+        """Create or move the selection outline and resize handles of a widget"""
+        outline = (x - 2, y - 2, x + width + 2, y + height + 2)
+        
+        # Resize handles
+        handle_size = 6
+        handles = [
+            (x - handle_size//2, y - handle_size//2),  # Top-left
+            (x + width - handle_size//2, y - handle_size//2),  # Top-right
+            (x - handle_size//2, y + height - handle_size//2),  # Bottom-left
+            (x + width - handle_size//2, y + height - handle_size//2),  # Bottom-right
+        ]
+        
+        items = self._selection_items.get(id(widget))
+        if items is None:
+            # Selection items are created on top and stay above all widgets
+            outline_id = self.canvas.create_rectangle(
+                *outline, fill='', outline='blue', width=2,
+                tags=(f"selection_{widget.id}", "selection")
             )
-            
-            # Draw resize handles
-            handle_size = 6
-            handles = [
-                (x - handle_size//2, y - handle_size//2),  # Top-left
-                (x + width - handle_size//2, y - handle_size//2),  # Top-right
-                (x - handle_size//2, y + height - handle_size//2),  # Bottom-left
-                (x + width - handle_size//2, y + height - handle_size//2),  # Bottom-right
-            ]
-            
-            for hx, hy in handles:
+            handle_ids = tuple(
                 self.canvas.create_rectangle(
                     hx, hy, hx + handle_size, hy + handle_size,
-                    fill='blue', outline='blue', tags=f"handle_{widget.id}"
+                    fill='blue', outline='blue', tags=(f"handle_{widget.id}", "selection")
                 )
+                for hx, hy in handles
+            )
+            self._selection_items[id(widget)] = (outline_id,) + handle_ids
+        else:
+            self.canvas.coords(items[0], *outline)
+            for item, (hx, hy) in zip(items[1:], handles):
+                self.canvas.coords(item, hx, hy, hx + handle_size, hy + handle_size)
+                
+    def remove_selection_items(self, widget: LVGLWidget):
+        """Delete the selection outline and resize handles of a widget"""
+        items = self._selection_items.pop(id(widget), None)
+        if items:
+            self.canvas.delete(*items)
+            
+    def raise_selection(self):
+        """Keep selection items above widget items created later"""
+        if self._selection_items:
+            self.canvas.tag_raise("selection")
                 
     def draw_widget_content(self, widget: LVGLWidget, x: float, y: float, width: float, height: float):
         """Draw widget-specific content with realistic LVGL appearance"""
-        text_size = max(8, int(12 * self.zoom_level))
+        text_size = self._text_size
+        handler = self._draw_dispatch.get(widget.widget_type, self._draw_unknown)
+        handler(widget, x, y, width, height, text_size)
+        
+    def _draw_label(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw label content"""
+        # Draw text with alignment
+        text = widget.text
+        text_color = self.parse_color(widget.text_color)
+        align = widget.text_align
+        
+        # Calculate text position based on alignment
+        if align == 'CENTER':
+            text_x, anchor = x + width//2, 'center'
+        elif align == 'RIGHT':
+            text_x, anchor = x + width - 5, 'e'
+        else:  # LEFT
+            text_x, anchor = x + 5, 'w'
+        
+        self._widget_items.create_text(
+            text_x, y + height//2, text=text,
+            font=('Arial', text_size), fill=text_color, anchor=anchor,
+            tags=f"widget_{widget.id}"
+        )
         
-        if widget.widget_type == "label":
-            # Draw text with alignment
-            text = getattr(widget, 'text', 'Label')
-            text_color = self.parse_color(getattr(widget, 'text_color', '#FFFFFF'))
-            align = getattr(widget, 'text_align', 'LEFT')
-            
-            # Calculate text position based on alignment
-            if align == 'CENTER':
-                text_x, anchor = x + width//2, 'center'
-            elif align == 'RIGHT':
-                text_x, anchor = x + width - 5, 'e'
-            else:  # LEFT
-                text_x, anchor = x + 5, 'w'
-                
-            self.canvas.create_text(
-                text_x, y + height//2, text=text,
-                font=('Arial', text_size), fill=text_color, anchor=anchor,
-                tags=f"widget_{widget.id}"
-            )
-            
-        elif widget.widget_type == "button":
-            # Draw button with gradient-like effect
-            button_text = getattr(widget, 'text', 'Button')
-            
-            # Button background with shadow effect
-            shadow_offset = max(1, int(2 * self.zoom_level))
-            self.canvas.create_rectangle(
-                x + shadow_offset, y + shadow_offset, 
-                x + width + shadow_offset, y + height + shadow_offset,
-                fill='#666666', outline='', tags=f"widget_{widget.id}"
-            )
-            
-            # Main button
-            button_color = self.parse_color(getattr(widget, 'bg_color', '#4CAF50'))
-            self.canvas.create_rectangle(
-                x, y, x + width, y + height,
-                fill=button_color, outline='#2E7D32', width=2,
-                tags=f"widget_{widget.id}"
-            )
-            
-            # Button highlight
-            highlight_height = max(2, int(height * 0.3))
-            self.canvas.create_rectangle(
-                x + 2, y + 2, x + width - 2, y + highlight_height,
-                fill='white', stipple='gray50', tags=f"widget_{widget.id}"
-            )
-            
-            # Button text
-            text_color = self.parse_color(getattr(widget, 'text_color', '#FFFFFF'))
-            self.canvas.create_text(
-                x + width//2, y + height//2, text=button_text,
-                font=('Arial', text_size, 'bold'), fill=text_color,
-                tags=f"widget_{widget.id}"
-            )
-            
-        elif widget.widget_type == "image":
-            # Try to load and display actual image if src is provided
-            src = getattr(widget, 'src', '')
-            if src and hasattr(self, 'load_image'):
-                try:
-                    # Try to load the actual image
-                    pil_image = self.load_image(src, int(width), int(height))
-                    if pil_image:
-                        photo = tk.PhotoImage(pil_image)
-                        self.canvas.create_image(
-                            x + width//2, y + height//2, image=photo,
-                            tags=f"widget_{widget.id}"
-                        )
-                        # Store reference to prevent garbage collection
-                        self.canvas.photo_refs = getattr(self.canvas, 'photo_refs', [])
-                        self.canvas.photo_refs.append(photo)
-                        return
-                except:
-                    pass
-            
-            # Draw image placeholder with better styling
-            self.canvas.create_rectangle(
-                x + 2, y + 2, x + width - 2, y + height - 2,
-                fill='#F0F0F0', outline='#CCCCCC', width=1,
-                tags=f"widget_{widget.id}"
-            )
-            
-            # Image icon
-            icon_size = min(width, height) * 0.4
-            icon_x, icon_y = x + width//2, y + height//2 - 5
-            
-            # Mountain shape
-            self.canvas.create_polygon(
-                icon_x - icon_size//2, icon_y + icon_size//4,
-                icon_x - icon_size//4, icon_y - icon_size//4,
-                icon_x, icon_y,
-                icon_x + icon_size//4, icon_y - icon_size//4,
-                icon_x + icon_size//2, icon_y + icon_size//4,
-                fill='#666666', tags=f"widget_{widget.id}"
-            )
-            
-            # Sun
-            sun_size = icon_size // 6
-            self.canvas.create_oval(
-                icon_x + icon_size//4 - sun_size, icon_y - icon_size//3 - sun_size,
-                icon_x + icon_size//4 + sun_size, icon_y - icon_size//3 + sun_size,
-                fill='#FFD700', outline='', tags=f"widget_{widget.id}"
-            )
-            
-            # File name if provided
-            if src:
-                self.canvas.create_text(
-                    x + width//2, y + height - 8, text=src[:12] + '...' if len(src) > 12 else src,
-                    font=('Arial', max(6, text_size - 2)), fill='#666666',
+    def _draw_button(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw button content"""
+        # Draw button with gradient-like effect
+        button_text = widget.text
+        
+        # Button background with shadow effect
+        shadow_offset = self._shadow_offset
+        self._widget_items.create_rectangle(
+            x + shadow_offset, y + shadow_offset, 
+            x + width + shadow_offset, y + height + shadow_offset,
+            fill='#666666', outline='', tags=f"widget_{widget.id}"
+        )
+        
+        # Main button
+        button_color = self.parse_color(widget.bg_color)
+        self._widget_items.create_rectangle(
+            x, y, x + width, y + height,
+            fill=button_color, outline='#2E7D32', width=2,
+            tags=f"widget_{widget.id}"
+        )
+        
+        # Button highlight
+        highlight_height = max(2, int(height * 0.3))
+        self._widget_items.create_rectangle(
+            x + 2, y + 2, x + width - 2, y + highlight_height,
+            fill='white', stipple='gray50', tags=f"widget_{widget.id}"
+        )
+        
+        # Button text
+        text_color = self.parse_color(widget.text_color)
+        self._widget_items.create_text(
+            x + width//2, y + height//2, text=button_text,
+            font=('Arial', text_size, 'bold'), fill=text_color,
+            tags=f"widget_{widget.id}"
+        )
+        
+    def _draw_image(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw image content"""
+        # Try to load and display actual image if src is provided
+        src = widget.src
+        if src:
+            # Try to load the actual image, the item cache keeps the photo referenced
+            photo = self.load_image(src, int(width), int(height))
+            if photo:
+                self._widget_items.create_image(
+                    x + width//2, y + height//2, image=photo,
                     tags=f"widget_{widget.id}"
                 )
-            
-        elif widget.widget_type == "slider":
-            # Draw enhanced slider
-            track_height = max(4, int(6 * self.zoom_level))
-            track_y = y + height // 2 - track_height // 2
-            margin = int(10 * self.zoom_level)
-            
-            # Track background
-            self.canvas.create_rectangle(
-                x + margin, track_y, x + width - margin, track_y + track_height,
-                fill='#CCCCCC', outline='#999999', tags=f"widget_{widget.id}"
-            )
-            
-            # Track progress
-            value = getattr(widget, 'value', 50)
-            max_val = getattr(widget, 'max_value', 100)
-            min_val = getattr(widget, 'min_value', 0)
-            progress_width = ((value - min_val) / (max_val - min_val)) * (width - 2 * margin)
-            
-            self.canvas.create_rectangle(
-                x + margin, track_y, x + margin + progress_width, track_y + track_height,
-                fill='#2196F3', outline='', tags=f"widget_{widget.id}"
-            )
-            
-            # Knob
-            knob_x = x + margin + progress_width
-            knob_size = max(12, int(16 * self.zoom_level))
-            
-            # Knob shadow
-            self.canvas.create_oval(
-                knob_x - knob_size//2 + 2, track_y + track_height//2 - knob_size//2 + 2,
-                knob_x + knob_size//2 + 2, track_y + track_height//2 + knob_size//2 + 2,
-                fill='#666666', outline='', tags=f"widget_{widget.id}"
-            )
-            
-            # Knob
-            self.canvas.create_oval(
-                knob_x - knob_size//2, track_y + track_height//2 - knob_size//2,
-                knob_x + knob_size//2, track_y + track_height//2 + knob_size//2,
-                fill='white', outline='#2196F3', width=2,
-                tags=f"widget_{widget.id}"
-            )
-            
-            # Value text
-            self.canvas.create_text(
-                x + width//2, y + height - 8, text=str(int(value)),
-                font=('Arial', max(8, text_size - 2)), fill='#333333',
+                return
+        
+        # Draw image placeholder with better styling
+        self._widget_items.create_rectangle(
+            x + 2, y + 2, x + width - 2, y + height - 2,
+            fill='#F0F0F0', outline='#CCCCCC', width=1,
+            tags=f"widget_{widget.id}"
+        )
+        
+        # Image icon
+        icon_size = min(width, height) * 0.4
+        icon_x, icon_y = x + width//2, y + height//2 - 5
+        
+        # Mountain shape
+        self._widget_items.create_polygon(
+            *_place_shape(_scaled_shape(_MOUNTAIN_UNIT, icon_size), icon_x, icon_y),
+            fill='#666666', tags=f"widget_{widget.id}"
+        )
+        
+        # Sun
+        sun_size = icon_size // 6
+        self._widget_items.create_oval(
+            icon_x + icon_size//4 - sun_size, icon_y - icon_size//3 - sun_size,
+            icon_x + icon_size//4 + sun_size, icon_y - icon_size//3 + sun_size,
+            fill='#FFD700', outline='', tags=f"widget_{widget.id}"
+        )
+        
+        # File name if provided
+        if src:
+            self._widget_items.create_text(
+                x + width//2, y + height - 8, text=src[:12] + '...' if len(src) > 12 else src,
+                font=('Arial', max(6, text_size - 2)), fill='#666666',
                 tags=f"widget_{widget.id}"
             )
-            
-        elif widget.widget_type == "switch":
-            # Draw iOS-style switch
-            switch_width = min(width - 10, int(50 * self.zoom_level))
-            switch_height = min(height - 10, int(25 * self.zoom_level))
-            switch_x = x + (width - switch_width) // 2
-            switch_y = y + (height - switch_height) // 2
-            
-            is_on = getattr(widget, 'state', False)
-            
+        
+    def _draw_slider(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw slider content"""
+        # Draw enhanced slider
+        track_height = self._track_height
+        track_y = y + height // 2 - track_height // 2
+        margin = self._slider_margin
+        
+        # Track background
+        self._widget_items.create_rectangle(
+            x + margin, track_y, x + width - margin, track_y + track_height,
+            fill='#CCCCCC', outline='#999999', tags=f"widget_{widget.id}"
+        )
+        
+        # Track progress
+        value = widget.value
+        max_val = widget.max_value
+        min_val = widget.min_value
+        progress_width = ((value - min_val) / (max_val - min_val)) * (width - 2 * margin)
+        
+        self._widget_items.create_rectangle(
+            x + margin, track_y, x + margin + progress_width, track_y + track_height,
+            fill='#2196F3', outline='', tags=f"widget_{widget.id}"
+        )
+        
+        # Knob
+        knob_x = x + margin + progress_width
+        knob_size = self._knob_size
+        
+        # Knob shadow
+        self._widget_items.create_oval(
+            knob_x - knob_size//2 + 2, track_y + track_height//2 - knob_size//2 + 2,
+            knob_x + knob_size//2 + 2, track_y + track_height//2 + knob_size//2 + 2,
+            fill='#666666', outline='', tags=f"widget_{widget.id}"
+        )
+        
+        # Knob
+        self._widget_items.create_oval(
+            knob_x - knob_size//2, track_y + track_height//2 - knob_size//2,
+            knob_x + knob_size//2, track_y + track_height//2 + knob_size//2,
+            fill='white', outline='#2196F3', width=2,
+            tags=f"widget_{widget.id}"
+        )
+        
+        # Value text
+        self._widget_items.create_text(
+            x + width//2, y + height - 8, text=str(int(value)),
+            font=('Arial', max(8, text_size - 2)), fill='#333333',
+            tags=f"widget_{widget.id}"
+        )
+        
+    def _draw_switch(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw switch content"""
+        # Draw iOS-style switch
+        switch_width = int(min(width - 10, self._switch_width))
+        switch_height = int(min(height - 10, self._switch_height))
+        switch_x = x + (width - switch_width) // 2
+        switch_y = y + (height - switch_height) // 2
+        if switch_width < 1 or switch_height < 1:
+            return
+        
+        is_on = widget.state
+        
+        def paint(draw, s):
             # Switch track
             track_color = '#4CAF50' if is_on else '#CCCCCC'
-            self.canvas.create_oval(
-                switch_x, switch_y, switch_x + switch_width, switch_y + switch_height,
-                fill=track_color, outline='#999999', tags=f"widget_{widget.id}"
-            )
+            draw.ellipse((0, 0, switch_width * s - 1, switch_height * s - 1),
+                         fill=track_color, outline='#999999', width=s)
             
-            # Switch knob
+            # Switch knob with shadow
             knob_size = switch_height - 4
-            knob_x = switch_x + switch_width - knob_size - 2 if is_on else switch_x + 2
-            
-            # Knob shadow
-            self.canvas.create_oval(
-                knob_x + 1, switch_y + 3, knob_x + knob_size + 1, switch_y + knob_size + 3,
-                fill='#888888', outline='', tags=f"widget_{widget.id}"
-            )
-            
-            # Knob
-            self.canvas.create_oval(
-                knob_x, switch_y + 2, knob_x + knob_size, switch_y + knob_size + 2,
-                fill='white', outline='#DDDDDD', tags=f"widget_{widget.id}"
-            )
-            
-        elif widget.widget_type == "checkbox":
-            # Draw modern checkbox
-            check_size = min(width - 10, height - 10, int(20 * self.zoom_level))
-            check_x = x + 5
-            check_y = y + (height - check_size) // 2
-            
-            is_checked = getattr(widget, 'checked', False)
-            
-            # Checkbox background
+            knob_x = switch_width - knob_size - 2 if is_on else 2
+            draw.ellipse(((knob_x + 1) * s, 3 * s, (knob_x + knob_size + 1) * s - 1, (knob_size + 3) * s - 1),
+                         fill='#888888')
+            draw.ellipse((knob_x * s, 2 * s, (knob_x + knob_size) * s - 1, (knob_size + 2) * s - 1),
+                         fill='white', outline='#DDDDDD', width=s)
+            
+        sprite = self.get_sprite(('switch', is_on, switch_width, switch_height),
+                                 (switch_width + 1, switch_height + 1), paint)
+        self._widget_items.create_image(
+            switch_x, switch_y, image=sprite, anchor='nw', tags=f"widget_{widget.id}"
+        )
+        
+    def _draw_checkbox(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw checkbox content"""
+        # Draw modern checkbox
+        check_size = int(min(width - 10, height - 10, self._check_size))
+        check_x = x + 5
+        check_y = y + (height - check_size) // 2
+        
+        is_checked = widget.checked
+        line_width = self._check_line_width
+        
+        def paint(draw, s):
+            # Checkbox background, the 2px border is centered on the box edge
             bg_color = '#2196F3' if is_checked else 'white'
             border_color = '#2196F3' if is_checked else '#CCCCCC'
-            
-            self.canvas.create_rectangle(
-                check_x, check_y, check_x + check_size, check_y + check_size,
-                fill=bg_color, outline=border_color, width=2,
-                tags=f"widget_{widget.id}"
-            )
+            draw.rectangle((0, 0, (check_size + 2) * s - 1, (check_size + 2) * s - 1),
+                           fill=bg_color, outline=border_color, width=2 * s)
             
             # Checkmark
             if is_checked:
-                # Draw checkmark path
                 check_points = [
-                    check_x + check_size * 0.2, check_y + check_size * 0.5,
-                    check_x + check_size * 0.45, check_y + check_size * 0.7,
-                    check_x + check_size * 0.8, check_y + check_size * 0.3
+                    ((1 + check_size * u) * s, (1 + check_size * v) * s)
+                    for u, v in zip(_CHECK_UNIT[0::2], _CHECK_UNIT[1::2])
                 ]
-                self.canvas.create_line(
-                    check_points, fill='white', width=max(2, int(3 * self.zoom_level)),
-                    capstyle='round', joinstyle='round', tags=f"widget_{widget.id}"
-                )
-                
-            # Label text
-            text = getattr(widget, 'text', 'Checkbox')
-            if text:
-                self.canvas.create_text(
-                    check_x + check_size + 8, y + height//2,
-                    text=text, font=('Arial', text_size), fill='white', anchor='w',
-                    tags=f"widget_{widget.id}"
-                )
+                draw.line(check_points, fill='white', width=line_width * s, joint='curve')
                 
-        elif widget.widget_type == "arc":
-            # Draw arc/circular progress
-            margin = max(3, int(5 * self.zoom_level))
-            value = getattr(widget, 'value', 25)
-            max_val = getattr(widget, 'max_value', 100)
-            
-            # Background arc
-            self.canvas.create_oval(
-                x + margin, y + margin, x + width - margin, y + height - margin,
-                fill='', outline='#EEEEEE', width=max(3, int(6 * self.zoom_level)),
-                tags=f"widget_{widget.id}"
+        if check_size >= 1:
+            sprite = self.get_sprite(('checkbox', is_checked, check_size, line_width),
+                                     (check_size + 2, check_size + 2), paint)
+            self._widget_items.create_image(
+                check_x - 1, check_y - 1, image=sprite, anchor='nw', tags=f"widget_{widget.id}"
             )
-            
-            # Progress arc
-            extent = (value / max_val) * 270  # 270 degrees max
-            if extent > 0:
-                self.canvas.create_arc(
-                    x + margin, y + margin, x + width - margin, y + height - margin,
-                    start=135, extent=extent, outline='#2196F3', 
-                    width=max(3, int(6 * self.zoom_level)), style='arc',
-                    tags=f"widget_{widget.id}"
-                )
-                
-            # Center value
-            self.canvas.create_text(
-                x + width//2, y + height//2, text=f"{int(value)}%",
-                font=('Arial', text_size, 'bold'), fill='white',
+        
+        # Label text
+        text = widget.text
+        if text:
+            self._widget_items.create_text(
+                check_x + check_size + 8, y + height//2,
+                text=text, font=('Arial', text_size), fill='white', anchor='w',
                 tags=f"widget_{widget.id}"
             )
-            
-        elif widget.widget_type == "bar":
-            # Draw progress bar
-            margin = max(2, int(3 * self.zoom_level))
-            value = getattr(widget, 'value', 50)
-            max_val = getattr(widget, 'max_value', 100)
-            min_val = getattr(widget, 'min_value', 0)
-            
-            # Background
-            self.canvas.create_rectangle(
+        
+    def _draw_arc(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw arc content"""
+        # Draw arc/circular progress
+        margin = self._arc_margin
+        value = widget.value
+        max_val = widget.max_value
+        
+        # Background arc
+        self._widget_items.create_oval(
+            x + margin, y + margin, x + width - margin, y + height - margin,
+            fill='', outline='#EEEEEE', width=self._arc_width,
+            tags=f"widget_{widget.id}"
+        )
+        
+        # Progress arc
+        extent = (value / max_val) * 270  # 270 degrees max
+        if extent > 0:
+            self._widget_items.create_arc(
                 x + margin, y + margin, x + width - margin, y + height - margin,
-                fill='#EEEEEE', outline='#CCCCCC', tags=f"widget_{widget.id}"
-            )
-            
-            # Progress
-            progress_width = ((value - min_val) / (max_val - min_val)) * (width - 2 * margin)
-            if progress_width > 0:
-                self.canvas.create_rectangle(
-                    x + margin, y + margin, x + margin + progress_width, y + height - margin,
-                    fill='#4CAF50', outline='', tags=f"widget_{widget.id}"
-                )
-                
-            # Value text
-            self.canvas.create_text(
-                x + width//2, y + height//2, text=f"{int(value)}%",
-                font=('Arial', text_size), fill='#333333',
+                start=135, extent=extent, outline='#2196F3', 
+                width=self._arc_width, style='arc',
                 tags=f"widget_{widget.id}"
             )
-            
-        elif widget.widget_type == "dropdown":
-            # Draw dropdown with arrow
-            dropdown_text = getattr(widget, 'text', 'Select...')
-            
-            # Background
-            self.canvas.create_rectangle(
-                x, y, x + width, y + height,
-                fill='white', outline='#CCCCCC', width=1,
-                tags=f"widget_{widget.id}"
+        
+        # Center value
+        self._widget_items.create_text(
+            x + width//2, y + height//2, text=f"{int(value)}%",
+            font=('Arial', text_size, 'bold'), fill='white',
+            tags=f"widget_{widget.id}"
+        )
+        
+    def _draw_bar(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw bar content"""
+        # Draw progress bar
+        margin = self._bar_margin
+        value = widget.value
+        max_val = widget.max_value
+        min_val = widget.min_value
+        
+        # Background
+        self._widget_items.create_rectangle(
+            x + margin, y + margin, x + width - margin, y + height - margin,
+            fill='#EEEEEE', outline='#CCCCCC', tags=f"widget_{widget.id}"
+        )
+        
+        # Progress
+        progress_width = ((value - min_val) / (max_val - min_val)) * (width - 2 * margin)
+        if progress_width > 0:
+            self._widget_items.create_rectangle(
+                x + margin, y + margin, x + margin + progress_width, y + height - margin,
+                fill='#4CAF50', outline='', tags=f"widget_{widget.id}"
             )
-            
-            # Text
-            self.canvas.create_text(
-                x + 8, y + height//2, text=dropdown_text,
-                font=('Arial', text_size), fill='#333333', anchor='w',
+        
+        # Value text
+        self._widget_items.create_text(
+            x + width//2, y + height//2, text=f"{int(value)}%",
+            font=('Arial', text_size), fill='#333333',
+            tags=f"widget_{widget.id}"
+        )
+        
+    def _draw_dropdown(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw dropdown content"""
+        # Draw dropdown with arrow
+        dropdown_text = widget.text
+        
+        # Background
+        self._widget_items.create_rectangle(
+            x, y, x + width, y + height,
+            fill='white', outline='#CCCCCC', width=1,
+            tags=f"widget_{widget.id}"
+        )
+        
+        # Text
+        self._widget_items.create_text(
+            x + 8, y + height//2, text=dropdown_text,
+            font=('Arial', text_size), fill='#333333', anchor='w',
+            tags=f"widget_{widget.id}"
+        )
+        
+        # Dropdown arrow
+        arrow_size = self._arrow_size
+        arrow_x = x + width - arrow_size - 8
+        arrow_y = y + height//2
+        
+        self._widget_items.create_polygon(
+            *_place_shape(_scaled_shape(_ARROW_UNIT, arrow_size), arrow_x, arrow_y),
+            fill='#666666', tags=f"widget_{widget.id}"
+        )
+        
+    def _draw_textarea(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw textarea content"""
+        # Draw text area
+        self._widget_items.create_rectangle(
+            x, y, x + width, y + height,
+            fill='white', outline='#CCCCCC', width=1,
+            tags=f"widget_{widget.id}"
+        )
+        
+        # Placeholder text or content
+        text_content = widget.text
+        lines = text_content.split('\n')[:max(1, int((height - 10) // (text_size + 2)))]
+        
+        for i, line in enumerate(lines):
+            self._widget_items.create_text(
+                x + 5, y + 5 + i * (text_size + 2),
+                text=line[:max(1, int((width - 10) // (text_size * 0.6)))],
+                font=('Arial', text_size), fill='#333333', anchor='nw',
                 tags=f"widget_{widget.id}"
             )
-            
-            # Dropdown arrow
-            arrow_size = max(6, int(8 * self.zoom_level))
-            arrow_x = x + width - arrow_size - 8
-            arrow_y = y + height//2
-            
-            self.canvas.create_polygon(
-                arrow_x, arrow_y - arrow_size//2,
-                arrow_x + arrow_size, arrow_y - arrow_size//2,
-                arrow_x + arrow_size//2, arrow_y + arrow_size//2,
-                fill='#666666', tags=f"widget_{widget.id}"
-            )
-            
-        elif widget.widget_type == "textarea":
-            # Draw text area
-            self.canvas.create_rectangle(
-                x, y, x + width, y + height,
-                fill='white', outline='#CCCCCC', width=1,
-                tags=f"widget_{widget.id}"
+        
+        # Cursor
+        if len(lines) > 0:
+            cursor_x = x + 5 + len(lines[-1]) * (text_size * 0.6)
+            cursor_y = y + 5 + (len(lines) - 1) * (text_size + 2)
+            self._widget_items.create_line(
+                cursor_x, cursor_y, cursor_x, cursor_y + text_size,
+                fill='#333333', width=1, tags=f"widget_{widget.id}"
             )
+        
+    def _draw_led(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw LED content"""
+        # Draw LED indicator
+        led_size = int(min(width - 10, height - 10))
+        led_x = x + (width - led_size) // 2
+        led_y = y + (height - led_size) // 2
+        if led_size < 1:
+            return
+        
+        is_on = widget.state
+        led_color = self.parse_color(widget.color) if is_on else '#660000'
+        
+        def paint(draw, s):
+            from PIL import ImageColor
             
-            # Placeholder text or content
-            text_content = getattr(widget, 'text', 'Enter text...')
-            lines = text_content.split('\n')[:max(1, int((height - 10) // (text_size + 2)))]
-            
-            for i, line in enumerate(lines):
-                self.canvas.create_text(
-                    x + 5, y + 5 + i * (text_size + 2),
-                    text=line[:max(1, int((width - 10) // (text_size * 0.6)))],
-                    font=('Arial', text_size), fill='#333333', anchor='nw',
-                    tags=f"widget_{widget.id}"
-                )
-                
-            # Cursor
-            if len(lines) > 0:
-                cursor_x = x + 5 + len(lines[-1]) * (text_size * 0.6)
-                cursor_y = y + 5 + (len(lines) - 1) * (text_size + 2)
-                self.canvas.create_line(
-                    cursor_x, cursor_y, cursor_x, cursor_y + text_size,
-                    fill='#333333', width=1, tags=f"widget_{widget.id}"
-                )
-                
-        elif widget.widget_type == "led":
-            # Draw LED indicator
-            led_size = min(width - 10, height - 10)
-            led_x = x + (width - led_size) // 2
-            led_y = y + (height - led_size) // 2
-            
-            is_on = getattr(widget, 'state', True)
-            led_color = getattr(widget, 'color', '#FF0000') if is_on else '#660000'
-            
-            # LED glow effect
+            # LED glow effect, 3px around the body
             if is_on:
-                glow_size = led_size + 6
-                self.canvas.create_oval(
-                    led_x - 3, led_y - 3, led_x + glow_size - 3, led_y + glow_size - 3,
-                    fill=led_color, stipple='gray25', outline='',
-                    tags=f"widget_{widget.id}"
-                )
+                glow_color = ImageColor.getrgb(led_color) + (64,)
+                draw.ellipse((0, 0, (led_size + 6) * s - 1, (led_size + 6) * s - 1), fill=glow_color)
                 
             # LED body
-            self.canvas.create_oval(
-                led_x, led_y, led_x + led_size, led_y + led_size,
-                fill=led_color, outline='#333333', width=1,
-                tags=f"widget_{widget.id}"
-            )
+            draw.ellipse((3 * s, 3 * s, (led_size + 3) * s - 1, (led_size + 3) * s - 1),
+                         fill=led_color, outline='#333333', width=s)
             
             # LED highlight
             if is_on:
+                highlight_x = 3 + led_size // 4
                 highlight_size = led_size // 3
-                self.canvas.create_oval(
-                    led_x + led_size//4, led_y + led_size//4,
-                    led_x + led_size//4 + highlight_size, led_y + led_size//4 + highlight_size,
-                    fill='white', outline='', tags=f"widget_{widget.id}"
-                )
+                draw.ellipse((highlight_x * s, highlight_x * s,
+                              (highlight_x + highlight_size) * s - 1, (highlight_x + highlight_size) * s - 1),
+                             fill='white')
                 
-        else:
-            # Draw widget type name for unsupported widgets
-            self.canvas.create_text(
-                x + width//2, y + height//2, text=widget.widget_type.title(),
-                font=('Arial', text_size), fill='white',
-                tags=f"widget_{widget.id}"
-            )
-            
-    def parse_color(self, color_str: str) -> str:
-        """Parse LVGL color format to tkinter color"""
+        sprite = self.get_sprite(('led', is_on, led_color, led_size), (led_size + 6, led_size + 6), paint)
+        self._widget_items.create_image(
+            led_x - 3, led_y - 3, image=sprite, anchor='nw', tags=f"widget_{widget.id}"
+        )
+        
+    def get_sprite(self, key: tuple, size: Tuple[int, int], paint: Callable):
+        """Get a pre-rendered widget sprite, painting it with PIL on a cache miss"""
+        sprite = self._sprite_cache.get(key)
+        if sprite is not None:
+            self._sprite_cache.move_to_end(key)
+            return sprite
+            
+        from PIL import Image, ImageDraw, ImageTk
+        
+        # Paint at a multiple of the size and scale down for smooth edges
+        scale = _SPRITE_SUPERSAMPLE
+        image = Image.new('RGBA', (size[0] * scale, size[1] * scale), (0, 0, 0, 0))
+        paint(ImageDraw.Draw(image), scale)
+        sprite = ImageTk.PhotoImage(image.resize(size, Image.Resampling.LANCZOS))
+        
+        self._sprite_cache[key] = sprite
+        if len(self._sprite_cache) > _SPRITE_CACHE_SIZE:
+            self._sprite_cache.popitem(last=False)
+        return sprite
+        
+    def _draw_unknown(self, widget: LVGLWidget, x: float, y: float, width: float, height: float, text_size: int):
+        """Draw the type name of widgets without a preview"""
+        # Draw widget type name for unsupported widgets
+        self._widget_items.create_text(
+            x + width//2, y + height//2, text=widget.widget_type.title(),
+            font=('Arial', text_size), fill='white',
+            tags=f"widget_{widget.id}"
+        )
+        
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def parse_color(color_str: str) -> str:
+        """Parse LVGL color format to tkinter color (cached, colors repeat a lot)"""
         if color_str.startswith('0x'):
             # Convert hex color
             hex_color = color_str[2:]
@@ -660,18 +1102,12 @@ class CanvasEditor:
             return color_str
         else:
             # Named colors
-            color_map = {
-                'red': '#FF0000', 'green': '#00FF00', 'blue': '#0000FF',
-                'white': '#FFFFFF', 'black': '#000000', 'gray': '#808080',
-                'yellow': '#FFFF00', 'cyan': '#00FFFF', 'magenta': '#FF00FF'
-            }
-            return color_map.get(color_str.lower(), '#FFFFFF')
+            return _NAMED_COLORS.get(color_str.lower(), '#FFFFFF')
             
     def load_image(self, src: str, width: int, height: int):
-        """Load and resize image for display"""
+        """Load and resize image for display, cached by file, modification time and size"""
         try:
             from PIL import Image, ImageTk
-            import os
             
             # Try to find the image file
             image_path = src
@@ -693,12 +1129,36 @@ class CanvasEditor:
             if not os.path.exists(image_path):
                 return None
                 
-            # Load and resize image
-            pil_image = Image.open(image_path)
-            pil_image = pil_image.resize((max(1, width - 4), max(1, height - 4)), Image.Resampling.LANCZOS)
+            # Reuse the decoded image if file and size didn't change
+            cache_key = (os.path.abspath(image_path), os.path.getmtime(image_path), width, height)
+            photo = self._image_cache.get(cache_key)
+            if photo is not None:
+                self._image_cache.move_to_end(cache_key)
+                return photo
+                
+            # Decode the file once for all zoom levels
+            source_key = cache_key[:2]
+            source = self._source_image_cache.get(source_key)
+            if source is None:
+                with Image.open(image_path) as pil_image:
+                    pil_image.load()
+                    source = pil_image.copy()
+                self._source_image_cache[source_key] = source
+                if len(self._source_image_cache) > _SOURCE_IMAGE_CACHE_SIZE:
+                    self._source_image_cache.popitem(last=False)
+            else:
+                self._source_image_cache.move_to_end(source_key)
+                
+            # Resize, large reductions first shrink by an integer factor in C
+            pil_image = source.resize((max(1, width - 4), max(1, height - 4)), Image.Resampling.LANCZOS,
+                                      reducing_gap=2.0)
             
             # Convert to PhotoImage
-            return ImageTk.PhotoImage(pil_image)
+            photo = ImageTk.PhotoImage(pil_image)
+            self._image_cache[cache_key] = photo
+            if len(self._image_cache) > _IMAGE_CACHE_SIZE:
+                self._image_cache.popitem(last=False)
+            return photo
             
         except Exception as e:
             print(f"Error loading image {src}: {e}")
@@ -706,10 +1166,10 @@ class CanvasEditor:
         
     def get_widget_info(self, widget_type: str) -> Dict[str, Any]:
         """Get widget information from the widget library"""
-        for category in LVGL_WIDGETS.values():
-            if widget_type in category:
-                return category[widget_type]
-        return {'name': widget_type.title(), 'default_size': (100, 30)}
+        info = WIDGET_INFO.get(widget_type)
+        if info is None:
+            return {'name': widget_type.title(), 'default_size': DEFAULT_WIDGET_SIZE}
+        return info
         
     # Event handlers
     def on_canvas_click(self, event):
@@ -720,25 +1180,39 @@ class CanvasEditor:
         if self.placing_widget:
             # Place new widget
             self.place_widget(canvas_x, canvas_y)
-        else:
-            # Select widget(s)
-            clicked_widget = self.get_widget_at_position(canvas_x, canvas_y)
+            self._request_redraw()
+            return
             
-            if not event.state & 0x4:  # Ctrl not pressed
+        # Select widget(s)
+        clicked_widget = self.get_widget_at_position(canvas_x, canvas_y)
+        ctrl = event.state & _CTRL_MASK
+        
+        if clicked_widget is None:
+            # A miss only changes what is drawn when it clears the selection
+            if not ctrl and self.selected_widgets:
+                self.mark_selection_dirty()
                 self.selected_widgets.clear()
-                
-            if clicked_widget:
-                if clicked_widget not in self.selected_widgets:
-                    self.selected_widgets.append(clicked_widget)
-                self.selection_callback(clicked_widget)
-                
-                # Start drag
-                self.drag_start = (canvas_x, canvas_y)
-                self.drag_widgets = self.selected_widgets.copy()
-            else:
-                self.selection_callback(None)
-                
-        self.draw_display()
+                self._request_redraw()
+            self.selection_callback(None)
+            return
+            
+        # Previous selection loses its highlight
+        self.mark_selection_dirty()
+        if not ctrl:
+            self.selected_widgets.clear()
+        self.selected_widgets.setdefault(clicked_widget.id, clicked_widget)
+        self.selection_callback(clicked_widget)
+        
+        # Start drag
+        self.drag_start = (canvas_x, canvas_y)
+        page = self.widgets[self.current_page]
+        geom = self.page_geometry(self.current_page)
+        ids, xs, ys = geom['id'], geom['x'], geom['y']
+        self._drag_indices = [(i, page[ids[i]], xs[i], ys[i]) for i in self._selected_indices()]
+        self.drag_widgets = [drag[1] for drag in self._drag_indices]
+        
+        self.mark_selection_dirty()
+        self._request_redraw()
         
     def on_canvas_drag(self, event):
         """Handle canvas drag events"""
@@ -746,35 +1220,76 @@ class CanvasEditor:
             canvas_x = self.canvas.canvasx(event.x)
             canvas_y = self.canvas.canvasy(event.y)
             
-            dx = (canvas_x - self.drag_start[0]) / self.zoom_level
-            dy = (canvas_y - self.drag_start[1]) / self.zoom_level
+            # Offset from the press position, so slow drags add up before snapping
+            inv_zoom = self._inv_zoom
+            dx = (canvas_x - self.drag_start[0]) * inv_zoom
+            dy = (canvas_y - self.drag_start[1]) * inv_zoom
             
             # Snap to grid if enabled
-            if self.snap_to_grid:
-                dx = round(dx / self.grid_size) * self.grid_size
-                dy = round(dy / self.grid_size) * self.grid_size
+            dx = self._snap(dx)
+            dy = self._snap(dy)
                 
-            for widget in self.drag_widgets:
-                new_x = max(0, widget.x + dx)
-                new_y = max(0, widget.y + dy)
+            # Keep within display bounds
+            max_x = self.display_config['width'] - 50
+            max_y = self.display_config['height'] - 30
+            geom = self.page_geometry(self.current_page)
+            xs, ys = geom['x'], geom['y']
+            zoom = self.zoom_level
+            
+            for i, widget, start_x, start_y in self._drag_indices:
+                new_x = min(max(0, start_x + dx), max_x)
+                new_y = min(max(0, start_y + dy), max_y)
                 
-                # Keep within display bounds
-                new_x = min(new_x, self.display_config['width'] - 50)
-                new_y = min(new_y, self.display_config['height'] - 30)
-                
-                widget.x = new_x
-                widget.y = new_y
-                
-            self.drag_start = (canvas_x, canvas_y)
-            self.draw_display()
+                # Shift the existing items instead of redrawing the widget
+                move_x, move_y = (new_x - xs[i]) * zoom, (new_y - ys[i]) * zoom
+                if move_x or move_y:
+                    self._widget_items.move_owner(id(widget), move_x, move_y)
+                    for item in self._selection_items.get(id(widget), ()):
+                        self.canvas.move(item, move_x, move_y)
+                        
+                xs[i] = widget.x = new_x
+                ys[i] = widget.y = new_y
+            self._scaled_cache.pop(self.current_page, None)
             
     def on_canvas_release(self, event):
         """Handle canvas release events"""
         if self.drag_start:
+            # Dragging moved the page geometry in place, move the dragged boxes in the spatial index
+            geom = self.page_geometry(self.current_page)
+            tree = geom.get('tree')
+            if tree is not None:
+                for drag in self._drag_indices:
+                    i = drag[0]
+                    tree.move(i, geom['x'][i], geom['y'][i], geom['w'][i], geom['h'][i])
+                if tree.degraded:
+                    del geom['tree']
+            
+            # Redraw the moved widgets once at their final position
+            for drag in self._drag_indices:
+                self.mark_dirty(drag[1])
+            self._request_redraw()
+            
             self.drag_start = None
             self.drag_widgets = []
+            self._drag_indices = []
             self.change_callback()
             
+    def create_context_menus(self):
+        """Create the right-click menus once, their commands act on the clicked widget"""
+        self._menu_target: Optional[LVGLWidget] = None
+        
+        self._menu_widget = tk.Menu(self.canvas, tearoff=0)
+        self._menu_widget.add_command(label="Edit", command=lambda: self.selection_callback(self._menu_target))
+        self._menu_widget.add_separator()
+        self._menu_widget.add_command(label="Copy", command=self.copy_selected)
+        self._menu_widget.add_command(label="Delete", command=self.delete_selected)
+        self._menu_widget.add_separator()
+        self._menu_widget.add_command(label="Bring to Front", command=lambda: self.bring_to_front(self._menu_target))
+        self._menu_widget.add_command(label="Send to Back", command=lambda: self.send_to_back(self._menu_target))
+        
+        self._menu_empty = tk.Menu(self.canvas, tearoff=0)
+        self._menu_empty.add_command(label="Paste", command=self.paste)
+        
     def on_canvas_right_click(self, event):
         """Handle right-click context menu"""
         canvas_x = self.canvas.canvasx(event.x)
@@ -782,23 +1297,14 @@ class CanvasEditor:
         
         clicked_widget = self.get_widget_at_position(canvas_x, canvas_y)
         
-        # Create context menu
-        context_menu = tk.Menu(self.canvas, tearoff=0)
-        
+        # Point the prebuilt menu at the clicked widget
         if clicked_widget:
-            context_menu.add_command(label=f"Edit {clicked_widget.widget_type}", 
-                                   command=lambda: self.selection_callback(clicked_widget))
-            context_menu.add_separator()
-            context_menu.add_command(label="Copy", command=self.copy_selected)
-            context_menu.add_command(label="Delete", command=self.delete_selected)
-            context_menu.add_separator()
-            context_menu.add_command(label="Bring to Front", 
-                                   command=lambda: self.bring_to_front(clicked_widget))
-            context_menu.add_command(label="Send to Back", 
-                                   command=lambda: self.send_to_back(clicked_widget))
+            self._menu_target = clicked_widget
+            context_menu = self._menu_widget
+            context_menu.entryconfigure(0, label=f"Edit {clicked_widget.widget_type}")
         else:
-            context_menu.add_command(label="Paste", command=self.paste, 
-                                   state='normal' if self.clipboard else 'disabled')
+            context_menu = self._menu_empty
+            context_menu.entryconfigure(0, state='normal' if self.clipboard else 'disabled')
             
         try:
             context_menu.tk_popup(event.x_root, event.y_root)
@@ -810,29 +1316,17 @@ class CanvasEditor:
         if self.current_page not in self.widgets:
             return None
             
-        # Check from front to back
-        for widget in reversed(self.widgets[self.current_page]):
-            widget_x = self.display_x + (widget.x * self.zoom_level)
-            widget_y = self.display_y + (widget.y * self.zoom_level)
-            
-            widget_info = self.get_widget_info(widget.widget_type)
-            default_width, default_height = widget_info.get('default_size', (100, 30))
+        # Query the page's spatial index in display units
+        tree = self.page_tree(self.current_page)
+        inv_zoom = self._inv_zoom
+        mx = (x - self.display_x) * inv_zoom
+        my = (y - self.display_y) * inv_zoom
+        hits = tree.query_point(mx, my)
+        if not hits:
+            return None
             
-            if isinstance(widget.width, str) and widget.width == "SIZE_CONTENT":
-                width = default_width * self.zoom_level
-            else:
-                width = widget.width * self.zoom_level
-                
-            if isinstance(widget.height, str) and widget.height == "SIZE_CONTENT":
-                height = default_height * self.zoom_level
-            else:
-                height = widget.height * self.zoom_level
-                
-            if (widget_x <= x <= widget_x + width and 
-                widget_y <= y <= widget_y + height):
-                return widget
-                
-        return None
+        # Indices follow the z-order, the highest one is in front
+        return self.widgets[self.current_page].get(self._page_geom[self.current_page]['id'][max(hits)])
         
     # Widget management
     def start_placing_widget(self, widget_type: str):
@@ -846,20 +1340,20 @@ class CanvasEditor:
             return
             
         # Convert canvas coordinates to display coordinates
-        display_x = (x - self.display_x) / self.zoom_level
-        display_y = (y - self.display_y) / self.zoom_level
+        inv_zoom = self._inv_zoom
+        display_x = (x - self.display_x) * inv_zoom
+        display_y = (y - self.display_y) * inv_zoom
         
         # Snap to grid if enabled
-        if self.snap_to_grid:
-            display_x = round(display_x / self.grid_size) * self.grid_size
-            display_y = round(display_y / self.grid_size) * self.grid_size
+        display_x = self._snap(display_x)
+        display_y = self._snap(display_y)
             
         # Ensure within bounds
         display_x = max(0, min(display_x, self.display_config['width'] - 50))
         display_y = max(0, min(display_y, self.display_config['height'] - 30))
         
         # Create widget
-        widget_id = f"{self.placing_widget}_{len(self.widgets.get(self.current_page, []))}"
+        widget_id = self.new_widget_id(self.placing_widget)
         
         widget = create_widget(
             self.placing_widget,
@@ -870,49 +1364,107 @@ class CanvasEditor:
         
         # Add to current page
         if self.current_page not in self.widgets:
-            self.widgets[self.current_page] = []
-        self.widgets[self.current_page].append(widget)
+            self.widgets[self.current_page] = OrderedDict()
+        self.widgets[self.current_page][widget.id] = widget
+        self.invalidate_geometry(self.current_page)
         
         # Select the new widget
-        self.selected_widgets = [widget]
+        self.mark_selection_dirty()
+        self.selected_widgets = {widget.id: widget}
+        self.mark_dirty(widget)
         self.selection_callback(widget)
         
         # Stop placing
         self.placing_widget = None
         self.canvas.configure(cursor="")
         
+        self._request_redraw()
         self.change_callback()
         
+    def new_widget_id(self, widget_type: str, page_id: Optional[str] = None) -> str:
+        """Get an id for a new widget that isn't used on the page (default: current page)"""
+        page_id = page_id or self.current_page
+        page = self.widgets.get(page_id, {})
+        key = (page_id, widget_type)
+        index = self._id_counters.get(key, 0)
+        # Only ids typed in by hand can be ahead of the counter
+        while f"{widget_type}_{index}" in page:
+            index += 1
+        self._id_counters[key] = index + 1
+        return f"{widget_type}_{index}"
+        
+    def seed_id_counters(self, page_id: str, widget_ids: Iterable[str]):
+        """Start the id counters of a page after the highest numbered ids in use"""
+        for widget_id in widget_ids:
+            match = _NUMBERED_ID.match(widget_id)
+            if match:
+                key = (page_id, match.group(1))
+                self._id_counters[key] = max(self._id_counters.get(key, 0), int(match.group(2)) + 1)
+        
+    def rename_widget(self, widget: LVGLWidget, new_id: str) -> bool:
+        """Change the id of a widget on the current page, keeping the z-order; empty or taken ids are refused"""
+        page = self.widgets.get(self.current_page)
+        old_id = widget.id
+        if new_id == old_id:
+            return True
+        if not new_id or page is None or page.get(old_id) is not widget or new_id in page:
+            return False
+            
+        # Follow the new id in the page dict and selection
+        widget.id = new_id
+        self.widgets[self.current_page] = OrderedDict(
+            (new_id if widget_id == old_id else widget_id, other) for widget_id, other in page.items()
+        )
+        if old_id in self.selected_widgets:
+            self.selected_widgets = {
+                new_id if widget_id == old_id else widget_id: other
+                for widget_id, other in self.selected_widgets.items()
+            }
+        return True
+        
     def update_widget_display(self, widget: LVGLWidget):
         """Update the display of a specific widget"""
-        self.draw_display()
+        # Position or size may have changed
+        self.invalidate_geometry(self.current_page)
+        self.mark_dirty(widget)
+        self._request_redraw()
         
     def update_display_size(self, width: int, height: int):
         """Update display size"""
         self.display_config['width'] = width
         self.display_config['height'] = height
         self.update_canvas_size()
-        self.draw_display()
+        self._request_redraw(full=True)
         
     # Selection management
     def select_all(self):
         """Select all widgets on current page"""
         if self.current_page in self.widgets:
-            self.selected_widgets = self.widgets[self.current_page].copy()
-            if self.selected_widgets:
-                self.selection_callback(self.selected_widgets[0])
-            self.draw_display()
-            
+            page = self.widgets[self.current_page]
+            self.selected_widgets = dict(page)
+            if page:
+                self.selection_callback(next(iter(page.values())))
+            self.mark_selection_dirty()
+            self._request_redraw()
+            
+    def select_widget(self, widget: LVGLWidget):
+        """Select a single widget, without notifying the selection callback"""
+        self.mark_selection_dirty()
+        self.selected_widgets = {widget.id: widget}
+        self.mark_selection_dirty()
+        self._request_redraw()
+        
     def clear_selection(self):
         """Clear widget selection"""
+        self.mark_selection_dirty()
         self.selected_widgets.clear()
         self.selection_callback(None)
-        self.draw_display()
+        self._request_redraw()
         
     # Clipboard operations
     def copy_selected(self):
         """Copy selected widgets to clipboard"""
-        self.clipboard = [copy.deepcopy(widget) for widget in self.selected_widgets]
+        self.clipboard = [widget.clone() for widget in self.get_selected_widgets()]
         
     def paste(self):
         """Paste widgets from clipboard"""
@@ -920,70 +1472,86 @@ class CanvasEditor:
             return
             
         if self.current_page not in self.widgets:
-            self.widgets[self.current_page] = []
+            self.widgets[self.current_page] = OrderedDict()
             
         # Paste with offset
         offset_x, offset_y = 20, 20
         new_widgets = []
         
         for widget in self.clipboard:
-            new_widget = copy.deepcopy(widget)
-            new_widget.id = f"{widget.widget_type}_{len(self.widgets[self.current_page])}"
+            new_widget = widget.clone()
+            new_widget.id = self.new_widget_id(widget.widget_type)
             new_widget.x += offset_x
             new_widget.y += offset_y
             
-            self.widgets[self.current_page].append(new_widget)
+            self.widgets[self.current_page][new_widget.id] = new_widget
             new_widgets.append(new_widget)
+        self.invalidate_geometry(self.current_page)
             
         # Select pasted widgets
-        self.selected_widgets = new_widgets
+        self.mark_selection_dirty()
+        self.selected_widgets = {widget.id: widget for widget in new_widgets}
+        self.mark_selection_dirty()
         if new_widgets:
             self.selection_callback(new_widgets[0])
             
         self.change_callback()
-        self.draw_display()
+        self._request_redraw()
         
     def delete_selected(self):
         """Delete selected widgets"""
         if self.current_page not in self.widgets:
             return
             
-        for widget in self.selected_widgets:
-            if widget in self.widgets[self.current_page]:
-                self.widgets[self.current_page].remove(widget)
+        # Take the selection off the page in one pass
+        page = self.widgets[self.current_page]
+        deleted = [id(widget) for widget_id, widget in self.selected_widgets.items()
+                   if page.pop(widget_id, None) is not None]
+        
+        # Only the items of deleted widgets change, remove them with one canvas call each
+        selection_items = []
+        for key in deleted:
+            selection_items.extend(self._selection_items.pop(key, ()))
+            self._dirty.pop(key, None)
+            self._hidden_widgets.discard(key)
+        if selection_items:
+            self.canvas.delete(*selection_items)
+        self._widget_items.discard(*deleted)
+        self.invalidate_geometry(self.current_page)
                 
         self.selected_widgets.clear()
         self.selection_callback(None)
         self.change_callback()
-        self.draw_display()
+        self._request_redraw()
         
     # Z-order management
     def bring_to_front(self, widget: LVGLWidget):
         """Bring widget to front"""
-        if self.current_page in self.widgets and widget in self.widgets[self.current_page]:
-            self.widgets[self.current_page].remove(widget)
-            self.widgets[self.current_page].append(widget)
+        page = self.widgets.get(self.current_page, {})
+        if page.get(widget.id) is widget:
+            page.move_to_end(widget.id)
+            self.invalidate_geometry(self.current_page)
+            self._widget_items.raise_owner(id(widget))
+            self.raise_selection()
             self.change_callback()
-            self.draw_display()
             
     def send_to_back(self, widget: LVGLWidget):
         """Send widget to back"""
-        if self.current_page in self.widgets and widget in self.widgets[self.current_page]:
-            self.widgets[self.current_page].remove(widget)
-            self.widgets[self.current_page].insert(0, widget)
+        page = self.widgets.get(self.current_page, {})
+        if page.get(widget.id) is widget:
+            page.move_to_end(widget.id, last=False)
+            self.invalidate_geometry(self.current_page)
+            self._widget_items.raise_owner(id(widget), above=self.bottom_anchor())
             self.change_callback()
-            self.draw_display()
             
     # View controls
     def zoom_in(self):
         """Zoom in on the canvas"""
-        self.zoom_level = min(self.zoom_level * 1.2, 5.0)
-        self.update_zoom_display()
+        self.set_zoom(min(self.zoom_level * 1.2, 5.0))
         
     def zoom_out(self):
         """Zoom out on the canvas"""
-        self.zoom_level = max(self.zoom_level / 1.2, 0.1)
-        self.update_zoom_display()
+        self.set_zoom(max(self.zoom_level / 1.2, 0.1))
         
     def zoom_fit(self):
         """Zoom to fit display in view"""
@@ -993,95 +1561,153 @@ class CanvasEditor:
         if canvas_width > 1 and canvas_height > 1:
             zoom_x = (canvas_width - 100) / self.display_config['width']
             zoom_y = (canvas_height - 100) / self.display_config['height']
-            self.zoom_level = min(zoom_x, zoom_y, 2.0)
-            self.update_zoom_display()
+            self.set_zoom(min(zoom_x, zoom_y, 2.0))
+            
+    def set_zoom(self, zoom: float):
+        """Scale the existing items to a new zoom level, redrawing once zooming stops"""
+        if zoom == self.zoom_level:
+            return
+        factor = zoom / self.zoom_level
+        self.zoom_level = zoom
+        self._inv_zoom = 1.0 / zoom
+        
+        # Stretch what is drawn as a preview, fonts and images keep their size until the redraw
+        self.canvas.scale("all", self.display_x, self.display_y, factor, factor)
+        self.zoom_label.config(text=f"{int(self.zoom_level * 100)}%")
+        
+        if self._zoom_after is not None:
+            self.canvas.after_cancel(self._zoom_after)
+        self._zoom_after = self.canvas.after(_ZOOM_SETTLE_MS, self._finalize_zoom)
+        
+    def _finalize_zoom(self):
+        """Redraw the canvas at the zoom level reached"""
+        self._zoom_after = None
+        self.update_zoom_display()
             
     def update_zoom_display(self):
         """Update zoom display and canvas"""
+        self._inv_zoom = 1.0 / self.zoom_level
         self.zoom_label.config(text=f"{int(self.zoom_level * 100)}%")
         self.update_canvas_size()
-        self.draw_display()
+        self._request_redraw(full=True)
         
     def toggle_grid(self):
         """Toggle grid visibility"""
         self.grid_visible = self.grid_var.get()
-        self.draw_display()
+        self._request_redraw(full=True)
         
     def toggle_snap(self):
         """Toggle snap to grid"""
         self.snap_to_grid = self.snap_var.get()
         
+    def set_grid_size(self, size: int):
+        """Set the grid size and precompute the snapping mask"""
+        self.grid_size = max(1, int(size))
+        if self.grid_size & (self.grid_size - 1) == 0:
+            # Power of two, snapping is a mask of the low bits
+            self._grid_mask = ~(self.grid_size - 1)
+            self._grid_half = self.grid_size // 2
+        else:
+            self._grid_mask = None
+        self._request_redraw(full=True)
+        
+    def _snap(self, value: float) -> float:
+        """Snap a value to the nearest grid line if snapping is enabled"""
+        if not self.snap_to_grid:
+            return value
+        if self._grid_mask is not None:
+            return (math.floor(value) + self._grid_half) & self._grid_mask
+        return round(value / self.grid_size) * self.grid_size
+        
     # Alignment tools
     def align_widgets(self, alignment: str):
         """Align selected widgets"""
-        if len(self.selected_widgets) < 2:
+        geom = self.page_geometry(self.current_page)
+        selected = self._selected_indices()
+        if len(selected) < 2:
             return
             
-        if alignment == 'left':
-            min_x = min(w.x for w in self.selected_widgets)
-            for widget in self.selected_widgets:
-                widget.x = min_x
-        elif alignment == 'right':
-            max_x = max(w.x + (w.width if isinstance(w.width, int) else 100) for w in self.selected_widgets)
-            for widget in self.selected_widgets:
-                widget.x = max_x - (widget.width if isinstance(widget.width, int) else 100)
-        elif alignment == 'center':
-            avg_x = sum(w.x + (w.width if isinstance(w.width, int) else 100) / 2 for w in self.selected_widgets) / len(self.selected_widgets)
-            for widget in self.selected_widgets:
-                widget.x = avg_x - (widget.width if isinstance(widget.width, int) else 100) / 2
-        elif alignment == 'top':
-            min_y = min(w.y for w in self.selected_widgets)
-            for widget in self.selected_widgets:
-                widget.y = min_y
-        elif alignment == 'bottom':
-            max_y = max(w.y + (w.height if isinstance(w.height, int) else 30) for w in self.selected_widgets)
-            for widget in self.selected_widgets:
-                widget.y = max_y - (widget.height if isinstance(widget.height, int) else 30)
-        elif alignment == 'middle':
-            avg_y = sum(w.y + (w.height if isinstance(w.height, int) else 30) / 2 for w in self.selected_widgets) / len(self.selected_widgets)
-            for widget in self.selected_widgets:
-                widget.y = avg_y - (widget.height if isinstance(widget.height, int) else 30) / 2
-                
-        self.change_callback()
-        self.draw_display()
+        # Work on the page geometry, sizes are already resolved there
+        if alignment in ('left', 'right', 'center'):
+            attr, positions, sizes = 'x', geom['x'], geom['w']
+        elif alignment in ('top', 'bottom', 'middle'):
+            attr, positions, sizes = 'y', geom['y'], geom['h']
+        else:
+            return
+            
+        if alignment in ('left', 'top'):
+            edge = min(map(positions.__getitem__, selected))
+            values = [edge] * len(selected)
+        elif alignment in ('right', 'bottom'):
+            edge = max(positions[i] + sizes[i] for i in selected)
+            values = [edge - sizes[i] for i in selected]
+        else:
+            center = sum(positions[i] + sizes[i] / 2 for i in selected) / len(selected)
+            values = [center - sizes[i] / 2 for i in selected]
+            
+        self._move_widgets(geom, attr, selected, values)
         
     def distribute_widgets(self, direction: str):
         """Distribute selected widgets evenly"""
-        if len(self.selected_widgets) < 3:
+        geom = self.page_geometry(self.current_page)
+        selected = self._selected_indices()
+        if len(selected) < 3:
             return
             
         if direction == 'horizontal':
-            self.selected_widgets.sort(key=lambda w: w.x)
-            total_width = self.selected_widgets[-1].x - self.selected_widgets[0].x
-            spacing = total_width / (len(self.selected_widgets) - 1)
-            
-            for i, widget in enumerate(self.selected_widgets[1:-1], 1):
-                widget.x = self.selected_widgets[0].x + i * spacing
-                
+            attr, positions = 'x', geom['x']
         elif direction == 'vertical':
-            self.selected_widgets.sort(key=lambda w: w.y)
-            total_height = self.selected_widgets[-1].y - self.selected_widgets[0].y
-            spacing = total_height / (len(self.selected_widgets) - 1)
+            attr, positions = 'y', geom['y']
+        else:
+            return
             
-            for i, widget in enumerate(self.selected_widgets[1:-1], 1):
-                widget.y = self.selected_widgets[0].y + i * spacing
-                
+        selected.sort(key=positions.__getitem__)
+        first = positions[selected[0]]
+        spacing = (positions[selected[-1]] - first) / (len(selected) - 1)
+        self._move_widgets(geom, attr, selected[1:-1],
+                           [first + i * spacing for i in range(1, len(selected) - 1)])
+        
+    def _selected_indices(self) -> List[int]:
+        """Get the page geometry indices of the selected widgets, in selection order"""
+        index = self.page_geometry(self.current_page)['index']
+        return [index[widget_id] for widget_id in self.selected_widgets if widget_id in index]
+        
+    def _move_widgets(self, geom: Dict[str, Any], attr: str, indices: List[int], values: List[float]):
+        """Set the x or y of widgets and their page geometry, then redraw them"""
+        page = self.widgets[self.current_page]
+        positions = geom[attr]
+        for i, value in zip(indices, values):
+            positions[i] = value
+            widget = page[geom['id'][i]]
+            setattr(widget, attr, value)
+            self.mark_dirty(widget)
+        self._scaled_cache.pop(self.current_page, None)
+        geom.pop('tree', None)
+        
         self.change_callback()
-        self.draw_display()
+        self._request_redraw()
         
     # Page management
     def set_current_page(self, page_id: str):
         """Set the current page"""
         self.current_page = page_id
         if page_id not in self.widgets:
-            self.widgets[page_id] = []
+            self.widgets[page_id] = OrderedDict()
         self.selected_widgets.clear()
         self.selection_callback(None)
-        self.draw_display()
+        self._request_redraw(full=True)
         
     def clear_all(self):
         """Clear all widgets"""
         self.widgets.clear()
+        self._id_counters.clear()
+        self.invalidate_geometry()
+        self._widget_items.clear()
+        self._dirty.clear()
+        self._hidden_widgets.clear()
+        for items in self._selection_items.values():
+            self.canvas.delete(*items)
+        self._selection_items.clear()
         self.selected_widgets.clear()
         self.selection_callback(None)
         
@@ -1089,7 +1715,7 @@ class CanvasEditor:
         """Get all widgets data for saving"""
         result = {}
         for page_id, page_widgets in self.widgets.items():
-            result[page_id] = [widget.to_dict() for widget in page_widgets]
+            result[page_id] = [widget.to_dict() for widget in page_widgets.values()]
         return result
         
     def get_widgets_for_page(self, page_id: str) -> List[Dict]:
@@ -1098,7 +1724,7 @@ class CanvasEditor:
             return []
         
         result = []
-        for widget in self.widgets[page_id]:
+        for widget in self.widgets[page_id].values():
             widget_data = widget.to_dict()
             # Add additional properties for preview
             widget_data.update({
@@ -1106,19 +1732,30 @@ class CanvasEditor:
                 'id': widget.id,
                 'x': widget.x,
                 'y': widget.y,
-                'width': widget.width,
-                'height': widget.height
+                'width': widget.width if widget.width != SIZE_CONTENT else "SIZE_CONTENT",
+                'height': widget.height if widget.height != SIZE_CONTENT else "SIZE_CONTENT"
             })
             result.append(widget_data)
         return result
         
-    def load_widgets(self, widgets_data: Dict[str, List[Dict]]):
-        """Load widgets from data"""
+    def load_widgets(self, widgets_data: Dict[str, List[Dict]]) -> List[Tuple[str, str, str]]:
+        """Load widgets from data, returning the (page id, old id, new id) of widgets that got a new id"""
+        renamed = []
         self.widgets.clear()
+        self._id_counters.clear()
+        self.invalidate_geometry()
         for page_id, page_widgets in widgets_data.items():
-            self.widgets[page_id] = []
-            for widget_data in page_widgets:
-                widget_type = widget_data.get('widget_type', 'obj')
-                widget = create_widget(widget_type, **widget_data)
-                self.widgets[page_id].append(widget)
-        self.draw_display()
+            page = self.widgets[page_id] = OrderedDict()
+            loaded = [create_widget(widget_data.get('widget_type', 'obj'), **widget_data)
+                      for widget_data in page_widgets]
+            
+            self.seed_id_counters(page_id, [widget.id for widget in loaded if widget.id])
+            for widget in loaded:
+                if not widget.id or widget.id in page:
+                    # Widgets are keyed by id, give missing or duplicate ones a new one
+                    old_id = widget.id
+                    widget.id = self.new_widget_id(widget.widget_type, page_id)
+                    renamed.append((page_id, old_id, widget.id))
+                page[widget.id] = widget
+        self._request_redraw(full=True)
+        return renamed
@@ -0,0 +1,148 @@
+"""
+Retained canvas items for the LVGL editor views
+"""
+
+import tkinter as tk
+from functools import partialmethod
+from typing import Dict, List, Hashable, Optional
+
+
+class CanvasItemCache:
+    """Keeps the canvas items of each owner alive between redraws
+
+    Drawing code calls the create_* methods of the cache between begin() and
+    end() instead of the ones of the canvas.  The n-th item an owner creates
+    reuses the item created at the same position during the previous redraw
+    if kind and option names match, so only changed coordinates/options are
+    sent to Tk.  Items that are not drawn again are deleted by end().  Owners
+    begun with a tag get it added to all their items, which lets
+    raise_owner() restack them with a single canvas call.
+    """
+
+    def __init__(self, canvas: tk.Canvas):
+        self.canvas = canvas
+        self.items: Dict[Hashable, List[list]] = {}  # owner -> [[signature, item_id, coords, options]]
+        self.tags: Dict[Hashable, str] = {}  # owner -> tag shared by all its items
+        self.created = False
+        self._owner = None
+        self._tag = None
+        self._old = []
+        self._new = []
+
+    def begin(self, owner: Hashable, tag: Optional[str] = None):
+        """Start (re)drawing the items of an owner, optionally tagging all of them"""
+        self._owner = owner
+        self._tag = tag
+        self._old = self.items.get(owner, [])
+        self._new = []
+        self.created = False
+
+    def create(self, kind: str, *coords, **options) -> int:
+        """Create the next item of the current owner, reusing the cached one if possible"""
+        if self._tag is not None:
+            tags = options.get('tags', ())
+            options['tags'] = ((tags,) if isinstance(tags, str) else tuple(tags)) + (self._tag,)
+        signature = (kind, tuple(sorted(options)))
+        index = len(self._new)
+        old = self._old
+
+        if index < len(old) and old[index][0] == signature:
+            slot = old[index]
+            item = slot[1]
+            if slot[2] != coords:
+                self.canvas.coords(item, *coords)
+                slot[2] = coords
+            if slot[3] != options:
+                self.canvas.itemconfigure(item, **options)
+                slot[3] = options
+        else:
+            if index < len(old):
+                # Item order changed, the remaining old items can't be reused
+                self.canvas.delete(*[s[1] for s in old[index:]])
+                self._old = old[:index]
+            item = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+            slot = [signature, item, coords, options]
+            self.created = True
+
+        self._new.append(slot)
+        return item
+
+    create_rectangle = partialmethod(create, 'rectangle')
+    create_oval = partialmethod(create, 'oval')
+    create_line = partialmethod(create, 'line')
+    create_polygon = partialmethod(create, 'polygon')
+    create_arc = partialmethod(create, 'arc')
+    create_text = partialmethod(create, 'text')
+    create_image = partialmethod(create, 'image')
+
+    def end(self):
+        """Finish drawing the current owner and delete its unused items"""
+        stale = self._old[len(self._new):]
+        if stale:
+            self.canvas.delete(*[slot[1] for slot in stale])
+        self.items[self._owner] = self._new
+        if self._tag is not None:
+            self.tags[self._owner] = self._tag
+        else:
+            self.tags.pop(self._owner, None)
+        self._owner = None
+        self._tag = None
+        self._old = []
+        self._new = []
+
+    def item_ids(self, owner: Hashable) -> List[int]:
+        """Get the canvas item ids of an owner in drawing order"""
+        return [slot[1] for slot in self.items.get(owner, [])]
+
+    def owners(self) -> List[Hashable]:
+        """Get all owners that currently have items"""
+        return list(self.items.keys())
+
+    def raise_owner(self, owner: Hashable, above=None):
+        """Move the items of an owner to the top (or right above an item), keeping their order"""
+        tag = self.tags.get(owner)
+        if tag is not None:
+            # Raising a tag keeps the relative order of its items
+            if above is None:
+                self.canvas.tag_raise(tag)
+            else:
+                self.canvas.tag_raise(tag, above)
+            return
+        for slot in self.items.get(owner, []):
+            if above is None:
+                self.canvas.tag_raise(slot[1])
+            else:
+                self.canvas.tag_raise(slot[1], above)
+                above = slot[1]
+
+    def lower_owner(self, owner: Hashable, below: Hashable):
+        """Move the items of an owner right below the items of another owner, keeping their order"""
+        below_items = self.items.get(below)
+        if not below_items:
+            return
+        reference = self.tags.get(below, below_items[0][1])
+        tag = self.tags.get(owner)
+        if tag is not None:
+            self.canvas.tag_lower(tag, reference)
+            return
+        for slot in self.items.get(owner, []):
+            self.canvas.tag_lower(slot[1], reference)
+
+    def move_owner(self, owner: Hashable, dx: float, dy: float):
+        """Move the items of an owner, keeping the cached coordinates in sync"""
+        for slot in self.items.get(owner, []):
+            self.canvas.move(slot[1], dx, dy)
+            slot[2] = tuple(v + (dx if i % 2 == 0 else dy) for i, v in enumerate(slot[2]))
+            
+    def discard(self, *owners: Hashable):
+        """Delete all items of one or more owners with a single canvas call"""
+        item_ids = []
+        for owner in owners:
+            item_ids.extend(slot[1] for slot in self.items.pop(owner, ()))
+            self.tags.pop(owner, None)
+        if item_ids:
+            self.canvas.delete(*item_ids)
+
+    def clear(self):
+        """Delete all cached items"""
+        self.discard(*list(self.items))
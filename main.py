@@ -5,23 +5,317 @@ A comprehensive graphical editor for creating LVGL layouts compatible with ESPHo
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, colorchooser
+from tkinter import ttk, messagebox, filedialog
+from tkinter import font as tkfont
+import functools
+import hashlib
+import marshal
 import yaml
 import json
 import os
-from typing import Dict, List, Any, Optional, Tuple
+import shutil
+import threading
+from types import MappingProxyType
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Callable, NamedTuple
 from dataclasses import dataclass, asdict
-from PIL import Image, ImageTk
-import copy
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # optional, project files are read and written with the json module without it
 
 # Import our modules
 from widgets import LVGLWidget, LVGL_WIDGETS
 from canvas_editor import CanvasEditor
+from canvas_items import CanvasItemCache
 from property_panel import PropertyPanel
 from widget_library import WidgetLibrary
-from yaml_generator import YAMLGenerator
+from yaml_generator import YAMLGenerator, YAML_LOADER
 from page_manager import PageManager
 
+# Scaled images kept for the device preview, sized down to a multiple of the step so that
+# resizing an image widget doesn't decode the image for every pixel
+_DEVICE_IMAGE_CACHE_SIZE = 64
+_DEVICE_IMAGE_SIZE_STEP = 8
+
+# Widget geometries kept for the device preview
+_DEVICE_GEOMETRY_CACHE_SIZE = 1024
+
+# Typing pause after which an edited display setting is applied
+_DISPLAY_CONFIG_DELAY_MS = 200
+
+# Pause in a device canvas resize after which its final size is handled
+_DEVICE_CANVAS_CONFIGURE_DELAY_MS = 50
+
+# Shortest interval between redraws for device preview interactions, about 60 per second
+_DEVICE_INTERACTION_FRAME_MS = 16
+
+# Interval in which finished background file operations are picked up
+_IO_POLL_MS = 20
+
+# Renamed widgets listed by name after loading a project
+_RENAMED_WIDGETS_SHOWN = 10
+
+# Block size project YAML files are hashed in for their parse cache
+_YAML_HASH_CHUNK_SIZE = 1 << 16
+
+# ESPHome YAML widget types and the internal types they are imported as, unknown ones become labels
+_YAML_TYPE_MAP = {
+    'obj': 'label',
+    'label': 'label',
+    'btn': 'button',
+    'slider': 'slider',
+    'switch': 'switch',
+    'checkbox': 'checkbox',
+    'img': 'image',
+    'bar': 'bar',
+    'arc': 'arc',
+    'led': 'led',
+    'dropdown': 'dropdown',
+    'textarea': 'textarea'
+}
+
+# Properties imported from YAML for every widget, with their defaults
+_YAML_BASE_DEFAULTS = MappingProxyType({
+    'x': 0,
+    'y': 0,
+    'width': 100,
+    'height': 30,
+    'text': '',
+    'bg_color': '#FFFFFF',
+    'text_color': '#000000',
+})
+
+# Widget-specific properties imported from YAML: internal type -> ((key, YAML key, default), ...)
+_YAML_TYPE_PROPERTIES = {
+    'slider': (('min_value', 'range_min', 0), ('max_value', 'range_max', 100), ('value', 'value', 50)),
+    'image': (('src', 'src', ''),),
+    'switch': (('state', 'state', False),),
+    'checkbox': (('checked', 'checked', False),),
+    'bar': (('min_value', 'range_min', 0), ('max_value', 'range_max', 100), ('value', 'value', 50)),
+    'arc': (('min_value', 'range_min', 0), ('max_value', 'range_max', 100), ('value', 'value', 25)),
+    'led': (('state', 'state', True), ('color', 'color', '#FF0000')),
+}
+
+# Checkmark polyline points as fractions of the checkbox size
+_CHECK_MARK_X = (0.2, 0.45, 0.8)
+_CHECK_MARK_Y = (0.5, 0.7, 0.3)
+
+# Horizontal and vertical placement per LVGL align: 0 = start, 1 = middle, 2 = end
+_ALIGN_PLACEMENT = {
+    'TOP_LEFT': (0, 0), 'TOP_MID': (1, 0), 'TOP_RIGHT': (2, 0),
+    'LEFT_MID': (0, 1), 'CENTER': (1, 1), 'RIGHT_MID': (2, 1),
+    'BOTTOM_LEFT': (0, 2), 'BOTTOM_MID': (1, 2), 'BOTTOM_RIGHT': (2, 2),
+}
+
+
+def _align_base(placement: int, free_space: int) -> int:
+    """Get the offset of an aligned widget from the free space left next to it"""
+    return (0, free_space // 2, free_space)[placement]
+
+
+@functools.lru_cache(maxsize=None)
+def _metrics_font(weight: str) -> tkfont.Font:
+    """Get the font the content of SIZE_CONTENT widgets is measured with"""
+    return tkfont.Font(family='Arial', size=12, weight=weight)
+
+
+@functools.lru_cache(maxsize=1024)
+def _text_width(text: str, weight: str = 'normal') -> int:
+    """Measure the width of a text in the preview font, in display pixels"""
+    return _metrics_font(weight).measure(text)
+
+
+@functools.lru_cache(maxsize=256)
+def _scaled_font_size(base: int, scale: float) -> int:
+    """Scale a preview font size, keeping it readable"""
+    return max(8, int(base * scale))
+
+
+@functools.lru_cache(maxsize=None)
+def _preview_font(size: int, weight: str = 'normal') -> tkfont.Font:
+    """Get the named font device widget texts of a size are drawn with, shared by all of them"""
+    return tkfont.Font(family='Arial', size=size, weight=weight)
+
+
+class PreviewMetrics(NamedTuple):
+    """Scale dependent sizes the device widgets are drawn with"""
+    scale: float
+    font_10: tkfont.Font
+    font_11: tkfont.Font
+    font_12: tkfont.Font
+    font_12_bold: tkfont.Font
+    slider_track: int
+    slider_margin: int
+    slider_knob: int
+    switch_width: int
+    switch_height: int
+    check_size: int
+    check_line: int
+    arc_margin: int
+    arc_width: int
+
+
+@functools.lru_cache(maxsize=64)
+def _preview_metrics(scale: float) -> PreviewMetrics:
+    """Compute the device widget sizes for a preview scale once"""
+    return PreviewMetrics(
+        scale=scale,
+        font_10=_preview_font(_scaled_font_size(10, scale)),
+        font_11=_preview_font(_scaled_font_size(11, scale)),
+        font_12=_preview_font(_scaled_font_size(12, scale)),
+        font_12_bold=_preview_font(_scaled_font_size(12, scale), 'bold'),
+        slider_track=max(4, int(8 * scale)),
+        slider_margin=max(8, int(12 * scale)),
+        slider_knob=max(12, int(18 * scale)),
+        switch_width=int(60 * scale),
+        switch_height=int(30 * scale),
+        check_size=int(24 * scale),
+        check_line=max(2, int(3 * scale)),
+        arc_margin=max(4, int(6 * scale)),
+        arc_width=max(4, int(8 * scale))
+    )
+
+
+def _preview_position(widget_data: dict) -> Optional[Tuple[float, float]]:
+    """Convert the position of a widget to numbers, None if it isn't numeric"""
+    try:
+        return float(str(widget_data.get('x', 0))), float(str(widget_data.get('y', 0)))
+    except (ValueError, TypeError):
+        return None
+
+
+def _preview_size(value, widget_type: str, widget_data: dict, is_width: bool) -> float:
+    """Convert a width or height to a number, estimating SIZE_CONTENT from the widget content"""
+    if value != "SIZE_CONTENT":
+        return float(str(value))
+    
+    # Calculate content-based size for different widget types
+    if widget_type == "label":
+        if is_width:
+            text = widget_data.get('text', 'Label')
+            return max(_text_width(text), 50)
+        return 20  # Single line text height
+    if widget_type == "button":
+        if is_width:
+            text = widget_data.get('text', 'Button')
+            return max(_text_width(text, 'bold') + 20, 80)  # Button padding
+        return 40  # Standard button height
+    if widget_type == "image":
+        return 64  # Default image size for both width and height
+    return 100 if is_width else 30  # Default sizes
+
+
+@functools.lru_cache(maxsize=512)
+def _find_image_path(src: str, base_paths: Tuple[str, ...]) -> Optional[str]:
+    """Search an image file in the image directories, cached as the search costs a stat per directory"""
+    if os.path.isabs(src) and os.path.exists(src):
+        return src
+        
+    for base_path in base_paths:
+        test_path = os.path.join(base_path, src)
+        if os.path.exists(test_path):
+            return test_path
+    return None
+
+
+def _decode_device_image(image_path: str, width: int, height: int) -> Any:
+    """Decode and resize a preview image, run in the file worker"""
+    from PIL import Image
+    
+    # Large reductions first shrink by an integer factor in C.
+    # JPEGs are decoded at a reduced scale right away, still at least twice the target size
+    with Image.open(image_path) as pil_image:
+        pil_image.draft('RGB', (width * 2, height * 2))
+        return pil_image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+
+def _read_project_file(filename: str) -> Any:
+    """Read and parse a project file, run in the file worker"""
+    if filename.endswith('.yaml'):
+        # ESPHome YAML
+        return _load_yaml_cached(filename)
+    if orjson is not None:
+        with open(filename, 'rb') as f:
+            # LVGL project file
+            return orjson.loads(f.read())
+    with open(filename, 'r', encoding='utf-8') as f:
+        # LVGL project file, UTF-8 like the files orjson writes
+        return json.load(f)
+
+
+def _yaml_cache_dir() -> str:
+    """Get the per-user directory parsed YAML files are cached in"""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'lvgl-editor', 'yaml')
+
+
+def _load_yaml_cached(filename: str) -> Any:
+    """Parse a YAML file, reusing the result of the last parse of the same file and content"""
+    # Hash the file in chunks, only a cache miss needs the parser to see it
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, 'rb') as f:
+        for chunk in iter(functools.partial(f.read, _YAML_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    header = f"# content-version: {digest.hexdigest()}\n".encode()
+    
+    # One cache per file in the user's cache directory, named after the hash of its absolute path:
+    # a content hash line followed by the marshalled data. Marshal only holds plain data, unlike
+    # pickle it can't run code, and nothing shipped along with a project is ever read as a cache
+    path_key = hashlib.blake2b(os.path.abspath(filename).encode('utf-8'), digest_size=16).hexdigest()
+    cache_path = os.path.join(_yaml_cache_dir(), f"{path_key}.marshal")
+    try:
+        with open(cache_path, 'rb') as f:
+            if f.readline() == header:
+                return marshal.load(f)
+    except Exception:
+        pass  # missing, stale or unreadable caches just mean parsing the YAML
+        
+    # The parser reads the file as a stream instead of one buffer holding all of it
+    with open(filename, 'rb') as f:
+        data = yaml.load(f, Loader=YAML_LOADER)
+    try:
+        content = header + marshal.dumps(data)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        _replace_file(cache_path, content, 'wb')
+    except (OSError, ValueError):
+        pass  # no cache without a writable cache directory or for data marshal can't hold, like timestamps
+    return data
+
+
+def _replace_file(filename: str, content: Any, mode: str, **options):
+    """Write a file through a temporary file next to it, so that a failed write never leaves it half written"""
+    temp_path = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, mode.replace('w', 'x'), **options) as f:
+            f.write(content)
+        if os.path.exists(filename):
+            # Keep the permissions of the file that gets replaced
+            shutil.copymode(filename, temp_path)
+        os.replace(temp_path, filename)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_text_file(filename: str, content: str):
+    """Write serialized project content to a file as UTF-8, run in the file worker"""
+    _replace_file(filename, content, 'w', encoding='utf-8')
+
+
+def _write_bytes_file(filename: str, content: bytes):
+    """Write encoded project content to a file, run in the file worker"""
+    _replace_file(filename, content, 'wb')
+
+
 class LVGLEditor:
     """Main LVGL Editor Application"""
     
@@ -44,6 +338,10 @@ class LVGLEditor:
         self.property_panel = None
         self.widget_library = None
         self.page_manager = None
+        self.project_tree = None
+        self.preview_scale_var = None
+        self.current_page_label = None
+        self.device_canvas = None
         self.yaml_generator = YAMLGenerator()
         
         # Device state for live preview
@@ -58,8 +356,73 @@ class LVGLEditor:
             'drag_start': None
         }
         
+        # Device preview drawing per widget type, others are drawn generic
+        self._device_draw_dispatch: Dict[str, Callable] = {
+            'button': self.draw_device_button,
+            'slider': self.draw_device_slider,
+            'switch': self.draw_device_switch,
+            'checkbox': self.draw_device_checkbox,
+            'image': self.draw_device_image,
+            'label': self.draw_device_label,
+            'bar': self.draw_device_bar,
+            'arc': self.draw_device_arc,
+            'led': self.draw_device_led,
+            'dropdown': self.draw_device_dropdown,
+            'textarea': self.draw_device_textarea,
+        }
+        
         # Image cache for device preview
-        self.device_image_cache = {}
+        self.device_image_cache = OrderedDict()  # (src, image width, image height) -> ImageTk.PhotoImage, LRU order
+        self._pending_device_images: Dict[tuple, set] = {}  # cache key -> ids of the widgets waiting for it
+        
+        # Directories relative image paths are searched in
+        self._image_base_paths = (
+            os.getcwd(),
+            os.path.join(os.getcwd(), 'images'),
+            os.path.join(os.getcwd(), 'assets'),
+            os.path.dirname(os.path.abspath(__file__))
+        )
+        
+        # Widget ids, types and data per page, parallel lists rebuilt after widget changes
+        self._page_draw_lists: Dict[str, Tuple[List[str], List[str], List[dict]]] = {}
+        
+        # Widget (size, alignment base) in the device preview per size, align and scale, LRU order
+        self._geom_cache: Dict[tuple, Tuple[int, int, int, int]] = OrderedDict()
+        
+        # Device preview items kept between redraws
+        self._preview_snapshots = {}  # preview item owner -> data and state the items were drawn from
+        self._preview_order = []  # ('widget', widget id) owners in drawing order
+        self._device_item_widgets: Dict[int, Tuple[str, str]] = {}  # clickable/draggable item -> (widget id, kind)
+        
+        # Pending after() ids of display settings being typed in
+        self._display_config_after: Dict[str, str] = {}
+        
+        # Project tree rows as last shown, (item id, parent, text, values) in tree order
+        self._tree_rows: List[Tuple[str, str, str, tuple]] = []
+        
+        # Preview and project tree updates are coalesced into one per idle cycle
+        self._preview_update_pending = False
+        self._tree_update_pending = False
+        
+        # Set when a preview update was skipped because the preview wasn't visible
+        self._preview_dirty = False
+        
+        # Set when widgets outside of the device canvas viewport were left undrawn
+        self._preview_culled = False
+        
+        # Pending after() id of a device canvas resize
+        self._device_canvas_configure_after: Optional[str] = None
+        
+        # Preview widgets whose device state changed since the last interaction frame
+        self._device_widget_updates = set()
+        self._device_widget_update_after: Optional[str] = None
+        
+        # Preview scale the preview was last updated for
+        self._last_preview_scale: Optional[float] = None
+        
+        # Project files are read, parsed and written off the Tk thread.
+        # A single worker runs file jobs in the order they were started, so a later save always wins
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
         
         # Initialize UI
         self.create_ui()
@@ -205,6 +568,11 @@ class LVGLEditor:
                                    textvariable=self.preview_scale_var, width=5,
                                    command=self.update_preview_scale)
         scale_spinbox.pack(side=tk.LEFT, padx=(2, 8))
+        self._last_preview_scale = self.preview_scale_var.get()
+        
+        # Typed scales apply on Enter or when leaving the field, unchanged ones are ignored
+        scale_spinbox.bind('<Return>', lambda e: self.update_preview_scale())
+        scale_spinbox.bind('<FocusOut>', lambda e: self.update_preview_scale())
         
         # Device selection
         ttk.Label(controls_row1, text="Device:").pack(side=tk.LEFT)
@@ -236,10 +604,13 @@ class LVGLEditor:
         
         # Create canvas with device styling
         self.device_canvas = tk.Canvas(canvas_container, bg='#1a1a1a', highlightthickness=0)
+        self._preview_items = CanvasItemCache(self.device_canvas)
         
         # Scrollbars for large previews
-        v_scroll = ttk.Scrollbar(canvas_container, orient=tk.VERTICAL, command=self.device_canvas.yview)
-        h_scroll = ttk.Scrollbar(canvas_container, orient=tk.HORIZONTAL, command=self.device_canvas.xview)
+        v_scroll = ttk.Scrollbar(canvas_container, orient=tk.VERTICAL,
+                                 command=lambda *args: self.scroll_device_canvas(self.device_canvas.yview, *args))
+        h_scroll = ttk.Scrollbar(canvas_container, orient=tk.HORIZONTAL,
+                                 command=lambda *args: self.scroll_device_canvas(self.device_canvas.xview, *args))
         
         self.device_canvas.configure(yscrollcommand=v_scroll.set, xscrollcommand=h_scroll.set)
         
@@ -257,6 +628,10 @@ class LVGLEditor:
         self.device_canvas.bind("<ButtonRelease-1>", self.on_device_release)
         self.device_canvas.bind("<Configure>", self.on_device_canvas_configure)
         
+        # Map events of the window and every widget in it reach the root, this catches
+        # deiconifying as well as the preview pane being shown again
+        self.root.bind("<Map>", self.on_preview_mapped, add="+")
+        
         # Initialize device preview
         self.update_device_preview()
         
@@ -267,28 +642,32 @@ class LVGLEditor:
         width_var = tk.StringVar(value=str(self.display_config['width']))
         width_entry = ttk.Entry(parent, textvariable=width_var, width=10)
         width_entry.grid(row=0, column=1, pady=2)
-        width_var.trace('w', lambda *args: self.update_display_config('width', width_var.get()))
+        width_var.trace('w', lambda *args: self.schedule_display_config('width', width_var))
+        width_entry.bind('<FocusOut>', lambda e: self.apply_display_config('width', width_var))
+        width_entry.bind('<Return>', lambda e: self.apply_display_config('width', width_var))
         
         # Height
         ttk.Label(parent, text="Height:").grid(row=1, column=0, sticky=tk.W, pady=2)
         height_var = tk.StringVar(value=str(self.display_config['height']))
         height_entry = ttk.Entry(parent, textvariable=height_var, width=10)
         height_entry.grid(row=1, column=1, pady=2)
-        height_var.trace('w', lambda *args: self.update_display_config('height', height_var.get()))
+        height_var.trace('w', lambda *args: self.schedule_display_config('height', height_var))
+        height_entry.bind('<FocusOut>', lambda e: self.apply_display_config('height', height_var))
+        height_entry.bind('<Return>', lambda e: self.apply_display_config('height', height_var))
         
         # Color depth
         ttk.Label(parent, text="Color Depth:").grid(row=2, column=0, sticky=tk.W, pady=2)
         depth_var = tk.StringVar(value=str(self.display_config['color_depth']))
         depth_combo = ttk.Combobox(parent, textvariable=depth_var, values=['16'], width=8)
         depth_combo.grid(row=2, column=1, pady=2)
-        depth_var.trace('w', lambda *args: self.update_display_config('color_depth', depth_var.get()))
+        depth_var.trace('w', lambda *args: self.schedule_display_config('color_depth', depth_var))
         
         # Buffer size
         ttk.Label(parent, text="Buffer Size:").grid(row=3, column=0, sticky=tk.W, pady=2)
         buffer_var = tk.StringVar(value=self.display_config['buffer_size'])
         buffer_combo = ttk.Combobox(parent, textvariable=buffer_var, values=['12%', '25%', '50%', '100%'], width=8)
         buffer_combo.grid(row=3, column=1, pady=2)
-        buffer_var.trace('w', lambda *args: self.update_display_config('buffer_size', buffer_var.get()))
+        buffer_var.trace('w', lambda *args: self.schedule_display_config('buffer_size', buffer_var))
         
     def create_menu(self):
         """Create the application menu"""
@@ -349,23 +728,35 @@ class LVGLEditor:
         help_menu.add_command(label="About", command=self.show_about)
         help_menu.add_command(label="LVGL Documentation", command=self.open_lvgl_docs)
         
-        # Bind keyboard shortcuts
-        self.root.bind('<Control-n>', lambda e: self.new_project())
-        self.root.bind('<Control-o>', lambda e: self.open_project())
-        self.root.bind('<Control-s>', lambda e: self.save_project())
-        self.root.bind('<Control-Shift-S>', lambda e: self.save_project_as())
-        self.root.bind('<Control-e>', lambda e: self.export_yaml())
-        self.root.bind('<Control-z>', lambda e: self.undo())
-        self.root.bind('<Control-y>', lambda e: self.redo())
-        self.root.bind('<Control-c>', lambda e: self.copy_widget())
-        self.root.bind('<Control-v>', lambda e: self.paste_widget())
-        self.root.bind('<Delete>', lambda e: self.delete_widget())
-        self.root.bind('<Control-a>', lambda e: self.select_all())
-        self.root.bind('<Control-plus>', lambda e: self.zoom_in())
-        self.root.bind('<Control-minus>', lambda e: self.zoom_out())
-        self.root.bind('<Control-0>', lambda e: self.zoom_fit())
+        # Bind keyboard shortcuts, all of them are dispatched by their key from one handler
+        self._shortcut_commands = {
+            'n': self.new_project,
+            'o': self.open_project,
+            's': self.save_project,
+            'S': self.save_project_as,
+            'e': self.export_yaml,
+            'z': self.undo,
+            'y': self.redo,
+            'c': self.copy_widget,
+            'v': self.paste_widget,
+            'Delete': self.delete_widget,
+            'a': self.select_all,
+            'plus': self.zoom_in,
+            'minus': self.zoom_out,
+            '0': self.zoom_fit,
+        }
+        for sequence in ('<Control-n>', '<Control-o>', '<Control-s>', '<Control-Shift-S>', '<Control-e>',
+                         '<Control-z>', '<Control-y>', '<Control-c>', '<Control-v>', '<Delete>',
+                         '<Control-a>', '<Control-plus>', '<Control-minus>', '<Control-0>'):
+            self.root.bind(sequence, self.on_shortcut)
         
     # Event handlers
+    def on_shortcut(self, event):
+        """Run the command of a keyboard shortcut"""
+        command = self._shortcut_commands.get(event.keysym)
+        if command is not None:
+            command()
+            
     def on_widget_selected(self, widget_type: str):
         """Handle widget selection from library"""
         self.canvas_editor.start_placing_widget(widget_type)
@@ -376,25 +767,33 @@ class LVGLEditor:
         
     def on_property_changed(self, widget: LVGLWidget, property_name: str, value: Any):
         """Handle property changes"""
-        if hasattr(widget, property_name):
+        if property_name == 'id':
+            # Widgets are keyed by id, renames to an empty or taken id are refused
+            if not self.canvas_editor.rename_widget(widget, value):
+                return
+        elif hasattr(widget, property_name):
             setattr(widget, property_name, value)
-            self.canvas_editor.update_widget_display(widget)
-            self.update_live_preview()
+        else:
+            return
+        self.canvas_editor.update_widget_display(widget)
+        self._page_draw_lists.clear()
+        self.update_live_preview()
             
     def on_widgets_changed(self):
         """Handle when widgets are modified"""
         # Could implement undo/redo here
+        self._page_draw_lists.clear()
         self.update_live_preview()
         self.update_project_tree()
         
     def on_page_changed(self, page_id: str, page_info: dict):
         """Handle page selection change"""
-        if self.canvas_editor:
+        if self.canvas_editor is not None:
             self.canvas_editor.set_current_page(page_id)
         self.device_state['current_page'] = page_id
         
         # Update current page label if it exists
-        if hasattr(self, 'current_page_label'):
+        if self.current_page_label is not None:
             self.current_page_label.config(text=page_id)
             
         self.update_live_preview()
@@ -415,7 +814,7 @@ class LVGLEditor:
             elif 'page_' in item:
                 # Switch to page
                 page_id = item_data['text']
-                if hasattr(self, 'page_manager'):
+                if self.page_manager is not None:
                     self.page_manager.select_page(page_id)
                     
     def on_tree_double_click(self, event):
@@ -430,82 +829,163 @@ class LVGLEditor:
                 widget_id = item_data['text']
                 self.select_widget_by_id(widget_id)
         
+    def schedule_display_config(self, key: str, value_var: tk.StringVar):
+        """Apply an edited display setting once typing paused, instead of on every keystroke"""
+        pending = self._display_config_after.pop(key, None)
+        if pending is not None:
+            self.root.after_cancel(pending)
+        self._display_config_after[key] = self.root.after(
+            _DISPLAY_CONFIG_DELAY_MS, lambda: self.apply_display_config(key, value_var))
+        
+    def apply_display_config(self, key: str, value_var: tk.StringVar):
+        """Apply an edited display setting right away"""
+        pending = self._display_config_after.pop(key, None)
+        if pending is not None:
+            self.root.after_cancel(pending)
+        self.update_display_config(key, value_var.get())
+        
     def update_display_config(self, key: str, value: str):
         """Update display configuration"""
         try:
             if key in ['width', 'height', 'color_depth']:
-                self.display_config[key] = int(value)
-            else:
-                self.display_config[key] = value
+                value = int(value)
+            if self.display_config.get(key) == value:
+                return
+            self.display_config[key] = value
             
             if key in ['width', 'height']:
                 self.canvas_editor.update_display_size(self.display_config['width'], self.display_config['height'])
-                self.live_preview.set_display_config(self.display_config)
+                self._geom_cache.clear()
+                self.update_live_preview()
         except ValueError:
             pass  # Invalid input, ignore
             
     def update_live_preview(self):
-        """Update the live preview with current data"""
-        if hasattr(self, 'device_canvas') and hasattr(self, 'canvas_editor'):
+        """Schedule a live preview update for the next idle cycle, repeated requests are coalesced"""
+        if not self._preview_update_pending:
+            self._preview_update_pending = True
+            self.root.after_idle(self._do_live_preview_update)
+            
+    def _do_live_preview_update(self):
+        """Run the scheduled live preview update"""
+        self._preview_update_pending = False
+        if self.device_canvas is not None and self.canvas_editor is not None:
             self.update_device_preview()
             
     def update_project_tree(self):
-        """Update the project tree view"""
-        if not hasattr(self, 'project_tree'):
-            return
-            
-        # Clear existing items
-        for item in self.project_tree.get_children():
-            self.project_tree.delete(item)
+        """Schedule a project tree update for the next idle cycle, repeated requests are coalesced"""
+        if not self._tree_update_pending:
+            self._tree_update_pending = True
+            self.root.after_idle(self._do_project_tree_update)
             
-        if not hasattr(self, 'canvas_editor') or not hasattr(self, 'page_manager') or not self.page_manager:
+    def _do_project_tree_update(self):
+        """Run the scheduled project tree update"""
+        self._tree_update_pending = False
+        if self.project_tree is None:
             return
             
-        # Add display settings node
-        display_node = self.project_tree.insert("", "end", "display", 
-                                               text="Display", 
-                                               values=("Config", f"{self.display_config['width']}x{self.display_config['height']}"))
-        
-        # Add pages
-        pages_data = self.page_manager.get_all_pages()
-        for page_id, page_info in pages_data.items():
-            page_node = self.project_tree.insert("", "end", f"page_{page_id}",
-                                                text=page_id,
-                                                values=("Page", page_info.get('name', page_id)))
-            
-            # Add widgets for this page
-            if self.canvas_editor:
-                widgets = self.canvas_editor.get_widgets_for_page(page_id)
-                for widget_data in widgets:
-                    widget_id = widget_data.get('id', 'unknown')
-                    widget_type = widget_data.get('widget_type', 'widget')
+        # Rows as (item id, parent, text, values) in tree order
+        rows = []
+        if self.canvas_editor is not None and self.page_manager is not None:
+            # Display settings node
+            rows.append(("display", "", "Display",
+                         ("Config", f"{self.display_config['width']}x{self.display_config['height']}")))
+            
+            # Pages and their widgets
+            pages_data = self.page_manager.get_all_pages_cached()
+            for page_id, page_info in pages_data.items():
+                page_node = f"page_{page_id}"
+                rows.append((page_node, "", page_id, ("Page", page_info.get('name', page_id))))
+                ids, types, datas = self.page_draw_lists(page_id)
+                for widget_id, widget_type, widget_data in zip(ids, types, datas):
                     size_info = f"{widget_data.get('width', 0)}x{widget_data.get('height', 0)}"
-                    
-                    self.project_tree.insert(page_node, "end", f"widget_{widget_id}",
-                                           text=widget_id,
-                                           values=(widget_type, size_info))
-                                       
-        # Expand all nodes
-        for item in self.project_tree.get_children():
-            self.project_tree.item(item, open=True)
+                    rows.append((f"widget_{widget_id}", page_node, widget_id, (widget_type, size_info)))
+                        
+        if rows != self._tree_rows:
+            self.sync_project_tree(rows)
+            
+    def sync_project_tree(self, rows: List[Tuple[str, str, str, tuple]]):
+        """Change the project tree to show the given rows, only touching rows that differ"""
+        tree = self.project_tree
+        old = {row[0]: row for row in self._tree_rows}
+        new_parents = {row[0]: row[1] for row in rows}
+        
+        # Delete rows that are gone or moved to another parent, deleting a parent takes its children along
+        removed = {iid for iid, row in old.items() if new_parents.get(iid, None) != row[1]}
+        top_removed = [iid for iid in removed if old[iid][1] not in removed]
+        if top_removed:
+            tree.delete(*top_removed)
+            
+        # Children in tree order as they are now
+        children: Dict[str, List[str]] = {}
+        for iid, parent, _, _ in self._tree_rows:
+            if iid not in removed:
+                children.setdefault(parent, []).append(iid)
+                
+        positions: Dict[str, int] = {}
+        for iid, parent, text, values in rows:
+            index = positions.get(parent, 0)
+            positions[parent] = index + 1
+            siblings = children.setdefault(parent, [])
+            
+            if iid not in old or iid in removed:
+                options = {'text': text, 'values': values}
+                if not parent:
+                    # Top level nodes (display and pages) are expanded
+                    options['open'] = True
+                tree.insert(parent, index, iid, **options)
+                siblings.insert(index, iid)
+                continue
+                
+            if old[iid][2:] != (text, values):
+                tree.item(iid, text=text, values=values)
+            if siblings[index] != iid:
+                siblings.remove(iid)
+                siblings.insert(index, iid)
+                tree.move(iid, parent, index)
+                
+        self._tree_rows = rows
+        
+    def page_draw_lists(self, page_id: str) -> Tuple[List[str], List[str], List[dict]]:
+        """Get the ids, types and preview data of the widgets of a page, in z-order"""
+        lists = self._page_draw_lists.get(page_id)
+        if lists is None:
+            datas = self.canvas_editor.get_widgets_for_page(page_id)
             
+            # Resolve alignments and convert positions once per widget change instead of on every redraw,
+            # unknown alignments stay at the top left
+            for widget_data in datas:
+                widget_data['_align_placement'] = _ALIGN_PLACEMENT.get(widget_data.get('align'), (0, 0))
+                widget_data['_position'] = _preview_position(widget_data)
+                
+            ids = [widget_data.get('id', 'unknown') for widget_data in datas]
+            types = [widget_data.get('widget_type', 'label') for widget_data in datas]
+            lists = self._page_draw_lists[page_id] = (ids, types, datas)
+        return lists
+        
     def select_widget_by_id(self, widget_id: str):
         """Select a widget by its ID"""
-        if hasattr(self, 'canvas_editor'):
+        if self.canvas_editor is not None:
             # Find widget in current page
             current_page = self.canvas_editor.current_page
-            if current_page in self.canvas_editor.widgets:
-                for widget in self.canvas_editor.widgets[current_page]:
-                    if widget.id == widget_id:
-                        self.canvas_editor.selected_widgets = [widget]
-                        self.canvas_editor.draw_display()
-                        self.property_panel.set_widget(widget)
-                        break
+            widget = self.canvas_editor.widgets.get(current_page, {}).get(widget_id)
+            if widget is not None:
+                self.canvas_editor.select_widget(widget)
+                self.property_panel.set_widget(widget)
                         
     # Device Preview Methods
     def update_preview_scale(self):
         """Update preview scale"""
-        self.update_device_preview()
+        try:
+            scale = self.preview_scale_var.get()
+        except tk.TclError:
+            return  # not a number (yet)
+        if scale == self._last_preview_scale:
+            return
+        self._last_preview_scale = scale
+        
+        self._geom_cache.clear()
+        self.update_live_preview()
         
     def refresh_device_preview(self):
         """Refresh the device preview"""
@@ -523,15 +1003,21 @@ class LVGLEditor:
             'drag_widget': None,
             'drag_start': None
         }
-        self.update_device_preview()
+        self.update_live_preview()
         
     def update_device_preview(self):
         """Update the device preview to look and behave like a real LVGL device"""
-        if not hasattr(self, 'device_canvas') or not hasattr(self, 'preview_scale_var'):
+        if self.device_canvas is None or self.preview_scale_var is None:
             return
             
+        # Nothing to draw into while the window is iconified or the preview pane hidden or collapsed
+        if not self.device_canvas.winfo_viewable() or self.device_canvas.winfo_width() <= 1:
+            self._preview_dirty = True
+            return
+        self._preview_dirty = False
+        
         try:
-            self.device_canvas.delete("all")
+            items = self._preview_items
             
             # Get current scale
             scale = self.preview_scale_var.get()
@@ -543,137 +1029,252 @@ class LVGLEditor:
             total_width = width + 2 * bezel_thickness
             total_height = height + 2 * bezel_thickness
             
-            # Set canvas scroll region
-            self.device_canvas.configure(scrollregion=(0, 0, total_width, total_height))
-            
-            # Draw device frame
-            self.device_canvas.create_rectangle(
-                0, 0, total_width, total_height,
-                fill='#2d2d2d', outline='#404040', width=2,
-                tags="device_frame"
-            )
-            
-            # Draw screen area
-            self.device_canvas.create_rectangle(
-                bezel_thickness, bezel_thickness,
-                bezel_thickness + width, bezel_thickness + height,
-                fill='#000000', outline='#666666', width=1,
-                tags="screen_area"
-            )
-            
             # Get current page data
             current_page = self.device_state['current_page']
-            if hasattr(self, 'canvas_editor') and hasattr(self, 'page_manager') and self.page_manager and self.canvas_editor:
-                pages_data = self.page_manager.get_all_pages()
+            has_page_data = self.page_manager is not None and self.canvas_editor is not None
+            pages_data = self.page_manager.get_all_pages_cached() if has_page_data else {}
+            bg_color = pages_data[current_page].get('background_color', '#000000') if current_page in pages_data else None
+            
+            # Device frame, screen and page background only change with the scale, display size and page background
+            snapshot = (scale, width, height, bg_color)
+            if 'background' not in items.items or self._preview_snapshots.get('background') != snapshot:
+                # Set canvas scroll region
+                self.device_canvas.configure(scrollregion=(0, 0, total_width, total_height))
                 
-                # Draw page background
-                if current_page in pages_data:
-                    page_info = pages_data[current_page]
-                    bg_color = page_info.get('background_color', '#000000')
-                    
-                    self.device_canvas.create_rectangle(
+                items.begin('background')
+                items.create_rectangle(
+                    0, 0, total_width, total_height,
+                    fill='#2d2d2d', outline='#404040', width=2,
+                    tags="device_frame"
+                )
+                items.create_rectangle(
+                    bezel_thickness, bezel_thickness,
+                    bezel_thickness + width, bezel_thickness + height,
+                    fill='#000000', outline='#666666', width=1,
+                    tags="screen_area"
+                )
+                if bg_color is not None:
+                    items.create_rectangle(
                         bezel_thickness + 1, bezel_thickness + 1,
                         bezel_thickness + width - 1, bezel_thickness + height - 1,
                         fill=bg_color, outline='',
                         tags="page_background"
                     )
-                
-                # Draw widgets
-                widgets = self.canvas_editor.get_widgets_for_page(current_page)
-                for widget_data in widgets:
-                    self.draw_device_widget(widget_data, bezel_thickness, scale)
+                items.end()
+                self._preview_snapshots['background'] = snapshot
+            
+            # Draw widgets, skipping the ones whose data and device state didn't change
+            ids, _, datas = self.page_draw_lists(current_page) if has_page_data else ([], [], [])
+            order = []
+            created_at = None  # index of the first widget that got new items
+            restack_from = None
+            
+            # Lookups done once instead of per widget
+            item_owners = items.items
+            snapshots = self._preview_snapshots
+            widget_snapshot = self.device_widget_snapshot
+            redraw_widget = self.redraw_device_widget
+            add_owner = order.append
+            
+            # Visible part of the canvas, widgets outside of it are drawn once scrolled into view
+            canvas = self.device_canvas
+            view_x0 = canvas.canvasx(0)
+            view_y0 = canvas.canvasy(0)
+            view_x1 = canvas.canvasx(canvas.winfo_width())
+            view_y1 = canvas.canvasy(canvas.winfo_height())
+            widget_box = self.device_widget_box
+            culled = False
+            
+            for widget_id, widget_data in zip(ids, datas):
+                owner = ('widget', widget_id)
+                add_owner(owner)
+                snapshot = widget_snapshot(widget_id, widget_data, scale, width, height)
+                existed = owner in item_owners
+                if created_at is not None and existed and restack_from is None:
+                    restack_from = created_at + 1
+                if existed and snapshots.get(owner) == snapshot:
+                    continue
+                    
+                # Drop the outdated items of a widget outside of the viewport instead of redrawing it
+                try:
+                    x, y, widget_width, widget_height = widget_box(widget_data, bezel_thickness, scale)
+                except (ValueError, TypeError):
+                    x, y, widget_width, widget_height = view_x0, view_y0, 0, 0
+                if x + widget_width < view_x0 or x > view_x1 or y + widget_height < view_y0 or y > view_y1:
+                    if existed:
+                        for item in items.item_ids(owner):
+                            self._device_item_widgets.pop(item, None)
+                        items.discard(owner)
+                        snapshots.pop(owner, None)
+                    culled = True
+                    continue
+                    
+                redraw_widget(widget_id, widget_data, bezel_thickness, scale)
+                snapshots[owner] = snapshot
+                if items.created and created_at is None:
+                    created_at = len(order) - 1
+                    
+            # Delete the items of widgets that are gone
+            drawn = set(order)
+            drawn.add('background')
+            for owner in items.owners():
+                if owner not in drawn:
+                    for item in items.item_ids(owner):
+                        self._device_item_widgets.pop(item, None)
+                    items.discard(owner)
+                    self._preview_snapshots.pop(owner, None)
+                    
+            # Restack if the z-order changed or new items ended up above existing ones
+            previous = set(self._preview_order)
+            kept = [owner for owner in self._preview_order if owner in drawn]
+            if kept != [owner for owner in order if owner in previous]:
+                restack_from = 0
+            if restack_from is not None:
+                for owner in order[restack_from:]:
+                    items.raise_owner(owner)
+            self._preview_order = order
+            self._preview_culled = culled
                     
         except Exception as e:
             print(f"Error updating device preview: {e}")
             import traceback
             traceback.print_exc()
                 
+    def device_widget_snapshot(self, widget_id: str, widget_data: dict, scale: float,
+                               width: int, height: int) -> tuple:
+        """Get the data and device state the preview items of a widget are drawn from"""
+        device_state = self.device_state
+        return (
+            widget_data, scale, width, height,
+            device_state['widget_states'].get(widget_id),
+            device_state['slider_values'].get(widget_id),
+            device_state['switch_states'].get(widget_id),
+            device_state['checkbox_states'].get(widget_id)
+        )
+        
+    def update_device_widget(self, widget_id: str):
+        """Redraw a single widget of the device preview after a change of its device state"""
+        items = self._preview_items
+        owner = ('widget', widget_id)
+        widget_data = self.find_widget_data_by_id(widget_id)
+        if self._preview_update_pending or self._preview_dirty or widget_data is None or owner not in items.items:
+            # A full update is due anyway or the widget isn't drawn yet
+            self.update_live_preview()
+            return
+            
+        scale = self.preview_scale_var.get()
+        width = int(self.display_config['width'] * scale)
+        height = int(self.display_config['height'] * scale)
+        snapshot = self.device_widget_snapshot(widget_id, widget_data, scale, width, height)
+        if self._preview_snapshots.get(owner) == snapshot:
+            return
+            
+        self.redraw_device_widget(widget_id, widget_data, int(20 * scale), scale)
+        self._preview_snapshots[owner] = snapshot
+        
+        # New items ended up on top, move the widget back below the lowest widget drawn above it in one restack
+        if items.created:
+            order = self._preview_order
+            for above in order[order.index(owner) + 1:]:
+                if above in items.items:
+                    items.lower_owner(owner, above)
+                    break
+                
+    def schedule_device_widget_update(self, widget_id: str):
+        """Redraw a preview widget after a change of its device state, at most once per interaction frame"""
+        self._device_widget_updates.add(widget_id)
+        if self._device_widget_update_after is None:
+            self._device_widget_update_after = self.root.after(
+                _DEVICE_INTERACTION_FRAME_MS, self._flush_device_widget_updates)
+            
+    def _flush_device_widget_updates(self):
+        """Run the scheduled preview widget redraws"""
+        self._device_widget_update_after = None
+        widget_ids, self._device_widget_updates = self._device_widget_updates, set()
+        for widget_id in widget_ids:
+            self.update_device_widget(widget_id)
+            
+    def device_widget_box(self, widget_data: dict, offset: int, scale: float) -> Tuple[int, int, int, int]:
+        """Get the device canvas position and size of a widget"""
+        width, height, base_x, base_y = self.device_widget_geometry(widget_data, scale)
+        position = widget_data.get('_position')
+        if position is None:
+            # Not converted up front or not numeric, in which case this raises
+            get = widget_data.get
+            position = float(str(get('x', 0))), float(str(get('y', 0)))
+        x = offset + base_x + int(position[0] * scale)
+        y = offset + base_y + int(position[1] * scale)
+        return x, y, width, height
+        
+    def redraw_device_widget(self, widget_id: str, widget_data: dict, offset: int, scale: float):
+        """Draw the preview items of a widget and record which of them react to clicks and drags"""
+        items = self._preview_items
+        owner = ('widget', widget_id)
+        item_widgets = self._device_item_widgets
+        for item in items.item_ids(owner):
+            item_widgets.pop(item, None)
+            
+        items.begin(owner, tag=f"device_item_{widget_id}")
+        try:
+            self.draw_device_widget(widget_data, offset, scale)
+        finally:
+            items.end()
+            
+        # Interactive items are tagged device_widget_<id>_clickable or _draggable
+        for _, item, _, options in items.items[owner]:
+            for tag in options.get('tags', ()):
+                if tag.endswith('_clickable'):
+                    item_widgets[item] = (widget_id, 'clickable')
+                elif tag.endswith('_draggable'):
+                    item_widgets[item] = (widget_id, 'draggable')
+                    
+    def device_widget_geometry(self, widget_data: dict, scale: float) -> Tuple[int, int, int, int]:
+        """Get the scaled size and alignment base position of a widget, cached per size, align and scale"""
+        get = widget_data.get
+        widget_type = get('widget_type', 'label')
+        width_val = get('width', 100)
+        height_val = get('height', 30)
+        placement_x, placement_y = placement = get('_align_placement', (0, 0))
+        display_width = self.display_config['width']
+        display_height = self.display_config['height']
+        
+        # Text only matters for content sized widgets
+        content_sized = width_val == "SIZE_CONTENT" or height_val == "SIZE_CONTENT"
+        key = (widget_type, width_val, height_val, placement, scale,
+               display_width, display_height, get('text') if content_sized else None)
+        geom_cache = self._geom_cache
+        cached = geom_cache.get(key)
+        if cached is not None:
+            geom_cache.move_to_end(key)
+            return cached
+            
+        # Convert size values with SIZE_CONTENT handling
+        width = int(_preview_size(width_val, widget_type, widget_data, True) * scale)
+        height = int(_preview_size(height_val, widget_type, widget_data, False) * scale)
+        
+        # Ensure minimum sizes
+        width = max(1, width)
+        height = max(1, height)
+        
+        # Base position from the alignment
+        base_x = _align_base(placement_x, int(display_width * scale) - width)
+        base_y = _align_base(placement_y, int(display_height * scale) - height)
+        
+        # Content sized widgets add an entry per edit of their text, so drop the least recently used ones
+        geometry = geom_cache[key] = (width, height, base_x, base_y)
+        if len(geom_cache) > _DEVICE_GEOMETRY_CACHE_SIZE:
+            geom_cache.popitem(last=False)
+        return geometry
+        
     def draw_device_widget(self, widget_data: dict, offset: int, scale: float):
         """Draw a widget on the device preview with full interactivity"""
-        widget_type = widget_data.get('widget_type', 'label')
-        widget_id = widget_data.get('id', 'unknown')
+        get = widget_data.get
+        widget_type = get('widget_type', 'label')
+        widget_id = get('id', 'unknown')
         
         # Calculate position and size with proper type conversion
         try:
-            x_val = widget_data.get('x', 0)
-            y_val = widget_data.get('y', 0)
-            width_val = widget_data.get('width', 100)
-            height_val = widget_data.get('height', 30)
-            align = widget_data.get('align', None)
-            
-            # Handle SIZE_CONTENT and convert to numbers
-            def convert_size_value(val, widget_data, is_width=True):
-                if val == "SIZE_CONTENT":
-                    # Calculate content-based size for different widget types
-                    if widget_type == "label":
-                        if is_width:
-                            text = widget_data.get('text', 'Label')
-                            return max(len(text) * 8, 50)  # Approximate text width
-                        else:
-                            return 20  # Single line text height
-                    elif widget_type == "button":
-                        if is_width:
-                            text = widget_data.get('text', 'Button')
-                            return max(len(text) * 10 + 20, 80)  # Button padding
-                        else:
-                            return 40  # Standard button height
-                    elif widget_type == "image":
-                        return 64  # Default image size for both width and height
-                    else:
-                        return 100 if is_width else 30  # Default sizes
-                else:
-                    return float(str(val))
-            
-            # Convert size values with SIZE_CONTENT handling
-            width = int(convert_size_value(width_val, widget_data, True) * scale)
-            height = int(convert_size_value(height_val, widget_data, False) * scale)
-            
-            # Ensure minimum sizes
-            width = max(1, width)
-            height = max(1, height)
-            
-            # Handle position calculation with alignment
-            if align and align != "TOP_LEFT":
-                # Calculate base position from alignment
-                display_width = int(self.display_config['width'] * scale)
-                display_height = int(self.display_config['height'] * scale)
-                
-                # Base positions for different alignments
-                if align == "CENTER":
-                    base_x = (display_width - width) // 2
-                    base_y = (display_height - height) // 2
-                elif align == "TOP_MID":
-                    base_x = (display_width - width) // 2
-                    base_y = 0
-                elif align == "TOP_RIGHT":
-                    base_x = display_width - width
-                    base_y = 0
-                elif align == "BOTTOM_LEFT":
-                    base_x = 0
-                    base_y = display_height - height
-                elif align == "BOTTOM_MID":
-                    base_x = (display_width - width) // 2
-                    base_y = display_height - height
-                elif align == "BOTTOM_RIGHT":
-                    base_x = display_width - width
-                    base_y = display_height - height
-                elif align == "LEFT_MID":
-                    base_x = 0
-                    base_y = (display_height - height) // 2
-                elif align == "RIGHT_MID":
-                    base_x = display_width - width
-                    base_y = (display_height - height) // 2
-                else:  # TOP_LEFT or unknown
-                    base_x = 0
-                    base_y = 0
-                
-                # Add offsets
-                x = offset + base_x + int(float(str(x_val)) * scale)
-                y = offset + base_y + int(float(str(y_val)) * scale)
-            else:
-                # Absolute positioning
-                x = offset + int(float(str(x_val)) * scale)
-                y = offset + int(float(str(y_val)) * scale)
+            x, y, width, height = self.device_widget_box(widget_data, offset, scale)
             
         except (ValueError, TypeError) as e:
             print(f"Error converting widget dimensions for {widget_id}: {e}")
@@ -683,38 +1284,17 @@ class LVGLEditor:
             width = int(100 * scale)
             height = int(30 * scale)
         
-        # Get widget state
-        widget_state = self.device_state['widget_states'].get(widget_id, {})
-        
         # Draw based on widget type
-        if widget_type == 'button':
-            self.draw_device_button(widget_data, x, y, width, height, widget_state)
-        elif widget_type == 'slider':
-            self.draw_device_slider(widget_data, x, y, width, height)
-        elif widget_type == 'switch':
-            self.draw_device_switch(widget_data, x, y, width, height)
-        elif widget_type == 'checkbox':
-            self.draw_device_checkbox(widget_data, x, y, width, height)
-        elif widget_type == 'image':
-            self.draw_device_image(widget_data, x, y, width, height)
-        elif widget_type == 'label':
-            self.draw_device_label(widget_data, x, y, width, height)
-        elif widget_type == 'bar':
-            self.draw_device_bar(widget_data, x, y, width, height)
-        elif widget_type == 'arc':
-            self.draw_device_arc(widget_data, x, y, width, height)
-        elif widget_type == 'led':
-            self.draw_device_led(widget_data, x, y, width, height)
-        elif widget_type == 'dropdown':
-            self.draw_device_dropdown(widget_data, x, y, width, height)
-        elif widget_type == 'textarea':
-            self.draw_device_textarea(widget_data, x, y, width, height)
-        else:
-            self.draw_device_generic(widget_data, x, y, width, height)
-            
-    def draw_device_button(self, widget_data: dict, x: int, y: int, width: int, height: int, state: dict):
+        handler = self._device_draw_dispatch.get(widget_type, self.draw_device_generic)
+        handler(widget_data, x, y, width, height, _preview_metrics(scale))
+        
+    def draw_device_button(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                           metrics: PreviewMetrics):
         """Draw an interactive button on device preview"""
         widget_id = widget_data.get('id', 'button')
+        tag = f"device_widget_{widget_id}"
+        click_tag = tag + "_clickable"
+        state = self.device_state['widget_states'].get(widget_id, {})
         text = widget_data.get('text', 'Button')
         bg_color = widget_data.get('bg_color', '#4CAF50')
         text_color = widget_data.get('text_color', '#FFFFFF')
@@ -727,107 +1307,112 @@ class LVGLEditor:
             # Pressed state - darker and slightly offset
             press_offset = 2
             button_color = self.darken_color(bg_color)
-            self.device_canvas.create_rectangle(
+            self._preview_items.create_rectangle(
                 x + press_offset, y + press_offset, x + width, y + height,
                 fill=button_color, outline='#FFFFFF', width=1,
-                tags=f"device_widget_{widget_id}"
+                tags=tag
             )
         else:
             # Normal state with shadow
-            self.device_canvas.create_rectangle(
+            self._preview_items.create_rectangle(
                 x + 2, y + 2, x + width + 2, y + height + 2,
                 fill='#333333', outline='',
-                tags=f"device_widget_{widget_id}"
+                tags=tag
             )
-            self.device_canvas.create_rectangle(
+            self._preview_items.create_rectangle(
                 x, y, x + width, y + height,
                 fill=bg_color, outline='#FFFFFF', width=1,
-                tags=f"device_widget_{widget_id}"
+                tags=tag
             )
             
             # Highlight
             if height > 10:
                 highlight_height = max(2, height // 4)
-                self.device_canvas.create_rectangle(
+                self._preview_items.create_rectangle(
                     x + 2, y + 2, x + width - 2, y + highlight_height,
                     fill='white', stipple='gray50',
-                    tags=f"device_widget_{widget_id}"
+                    tags=tag
                 )
         
         # Button text
-        font_size = max(8, int(12 * self.preview_scale_var.get()))
         text_y_offset = 2 if pressed else 0
-        self.device_canvas.create_text(
+        self._preview_items.create_text(
             x + width//2, y + height//2 + text_y_offset, text=text,
-            font=('Arial', font_size, 'bold'), fill=text_color,
-            tags=f"device_widget_{widget_id}_clickable"
+            font=metrics.font_12_bold, fill=text_color,
+            tags=click_tag
         )
         
-    def draw_device_slider(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def draw_device_slider(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                           metrics: PreviewMetrics):
         """Draw an interactive slider on device preview"""
         widget_id = widget_data.get('id', 'slider')
+        tag = f"device_widget_{widget_id}"
+        drag_tag = tag + "_draggable"
         value = self.device_state['slider_values'].get(widget_id, widget_data.get('value', 50))
         min_val = widget_data.get('min_value', 0)
         max_val = widget_data.get('max_value', 100)
         
         # Track
-        track_height = max(4, int(8 * self.preview_scale_var.get()))
+        track_height = metrics.slider_track
         track_y = y + height // 2 - track_height // 2
-        margin = max(8, int(12 * self.preview_scale_var.get()))
+        margin = metrics.slider_margin
         
         # Track background
-        self.device_canvas.create_rectangle(
+        self._preview_items.create_rectangle(
             x + margin, track_y, x + width - margin, track_y + track_height,
             fill='#444444', outline='#666666', width=1,
-            tags=f"device_widget_{widget_id}"
+            tags=tag
         )
         
         # Track progress
+        # Whole pixels, so drags within a pixel leave the items untouched
         progress_ratio = (value - min_val) / (max_val - min_val) if max_val > min_val else 0
-        progress_width = progress_ratio * (width - 2 * margin)
-        self.device_canvas.create_rectangle(
+        progress_width = int(progress_ratio * (width - 2 * margin))
+        self._preview_items.create_rectangle(
             x + margin, track_y, x + margin + progress_width, track_y + track_height,
             fill='#2196F3', outline='',
-            tags=f"device_widget_{widget_id}"
+            tags=tag
         )
         
         # Knob
         knob_x = x + margin + progress_width
-        knob_size = max(12, int(18 * self.preview_scale_var.get()))
+        knob_size = metrics.slider_knob
         
         # Knob shadow
-        self.device_canvas.create_oval(
+        self._preview_items.create_oval(
             knob_x - knob_size//2 + 1, track_y + track_height//2 - knob_size//2 + 1,
             knob_x + knob_size//2 + 1, track_y + track_height//2 + knob_size//2 + 1,
             fill='#333333', outline='',
-            tags=f"device_widget_{widget_id}"
+            tags=tag
         )
         
         # Knob
-        self.device_canvas.create_oval(
+        self._preview_items.create_oval(
             knob_x - knob_size//2, track_y + track_height//2 - knob_size//2,
             knob_x + knob_size//2, track_y + track_height//2 + knob_size//2,
             fill='white', outline='#2196F3', width=2,
-            tags=f"device_widget_{widget_id}_draggable"
+            tags=drag_tag
         )
         
         # Value display
         if height > 25:
-            font_size = max(8, int(10 * self.preview_scale_var.get()))
-            self.device_canvas.create_text(
+            self._preview_items.create_text(
                 x + width//2, y + height - 8, text=f"{int(value)}",
-                font=('Arial', font_size), fill='#FFFFFF',
-                tags=f"device_widget_{widget_id}"
+                font=metrics.font_10, fill='#FFFFFF',
+                tags=tag
             )
             
-    def draw_device_switch(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def draw_device_switch(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                           metrics: PreviewMetrics):
         """Draw an interactive switch on device preview"""
         widget_id = widget_data.get('id', 'switch')
+        tag = f"device_widget_{widget_id}"
+        click_tag = tag + "_clickable"
         state = self.device_state['switch_states'].get(widget_id, widget_data.get('state', False))
         
         # Switch dimensions
-        switch_width = min(width - 8, int(60 * self.preview_scale_var.get()))
-        switch_height = min(height - 8, int(30 * self.preview_scale_var.get()))
+        switch_width = min(width - 8, metrics.switch_width)
+        switch_height = min(height - 8, metrics.switch_height)
         switch_x = x + (width - switch_width) // 2
         switch_y = y + (height - switch_height) // 2
         
@@ -835,10 +1420,10 @@ class LVGLEditor:
         track_color = '#4CAF50' if state else '#666666'
         
         # Track
-        self.device_canvas.create_oval(
+        self._preview_items.create_oval(
             switch_x, switch_y, switch_x + switch_width, switch_y + switch_height,
             fill=track_color, outline='#FFFFFF', width=1,
-            tags=f"device_widget_{widget_id}_clickable"
+            tags=click_tag
         )
         
         # Knob with animation
@@ -846,27 +1431,30 @@ class LVGLEditor:
         knob_x = switch_x + switch_width - knob_size - 3 if state else switch_x + 3
         
         # Knob shadow
-        self.device_canvas.create_oval(
+        self._preview_items.create_oval(
             knob_x + 1, switch_y + 3 + 1, knob_x + knob_size + 1, switch_y + knob_size + 3 + 1,
             fill='#333333', outline='',
-            tags=f"device_widget_{widget_id}"
+            tags=tag
         )
         
         # Knob
-        self.device_canvas.create_oval(
+        self._preview_items.create_oval(
             knob_x, switch_y + 3, knob_x + knob_size, switch_y + knob_size + 3,
             fill='white', outline='#DDDDDD', width=1,
-            tags=f"device_widget_{widget_id}_clickable"
+            tags=click_tag
         )
         
-    def draw_device_checkbox(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def draw_device_checkbox(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                             metrics: PreviewMetrics):
         """Draw an interactive checkbox on device preview"""
         widget_id = widget_data.get('id', 'checkbox')
+        tag = f"device_widget_{widget_id}"
+        click_tag = tag + "_clickable"
         checked = self.device_state['checkbox_states'].get(widget_id, widget_data.get('checked', False))
         text = widget_data.get('text', 'Checkbox')
         
         # Checkbox dimensions
-        check_size = min(width//3, height - 6, int(24 * self.preview_scale_var.get()))
+        check_size = min(width//3, height - 6, metrics.check_size)
         check_x = x + 4
         check_y = y + (height - check_size) // 2
         
@@ -875,191 +1463,243 @@ class LVGLEditor:
         border_color = '#2196F3' if checked else '#CCCCCC'
         
         # Checkbox shadow
-        self.device_canvas.create_rectangle(
+        self._preview_items.create_rectangle(
             check_x + 1, check_y + 1, check_x + check_size + 1, check_y + check_size + 1,
             fill='#333333', outline='',
-            tags=f"device_widget_{widget_id}"
+            tags=tag
         )
         
         # Checkbox
-        self.device_canvas.create_rectangle(
+        self._preview_items.create_rectangle(
             check_x, check_y, check_x + check_size, check_y + check_size,
             fill=bg_color, outline=border_color, width=2,
-            tags=f"device_widget_{widget_id}_clickable"
+            tags=click_tag
         )
         
         # Checkmark
         if checked and check_size > 10:
             check_points = [
-                check_x + check_size * 0.2, check_y + check_size * 0.5,
-                check_x + check_size * 0.45, check_y + check_size * 0.7,
-                check_x + check_size * 0.8, check_y + check_size * 0.3
+                coord
+                for mark_x, mark_y in zip(_CHECK_MARK_X, _CHECK_MARK_Y)
+                for coord in (check_x + check_size * mark_x, check_y + check_size * mark_y)
             ]
-            self.device_canvas.create_line(
-                check_points, fill='white', width=max(2, int(3 * self.preview_scale_var.get())),
+            self._preview_items.create_line(
+                check_points, fill='white', width=metrics.check_line,
                 capstyle='round', joinstyle='round',
-                tags=f"device_widget_{widget_id}"
+                tags=tag
             )
             
         # Label
         if text and width > check_size + 15:
-            font_size = max(8, int(11 * self.preview_scale_var.get()))
-            self.device_canvas.create_text(
+            self._preview_items.create_text(
                 check_x + check_size + 10, y + height//2,
-                text=text, font=('Arial', font_size), fill='#FFFFFF', anchor='w',
-                tags=f"device_widget_{widget_id}"
+                text=text, font=metrics.font_11, fill='#FFFFFF', anchor='w',
+                tags=tag
             )
             
-    def draw_device_image(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def draw_device_image(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                          metrics: PreviewMetrics):
         """Draw image widget on device preview"""
         widget_id = widget_data.get('id', 'image')
+        tag = f"device_widget_{widget_id}"
         src = widget_data.get('src', '')
         
         # Try to load image
         if src:
             try:
-                cache_key = f"{src}_{width}_{height}"
-                if cache_key in self.device_image_cache:
-                    photo = self.device_image_cache[cache_key]
+                image_width = max(1, width - 4)
+                image_height = max(1, height - 4)
+                if image_width > _DEVICE_IMAGE_SIZE_STEP:
+                    image_width -= image_width % _DEVICE_IMAGE_SIZE_STEP
+                if image_height > _DEVICE_IMAGE_SIZE_STEP:
+                    image_height -= image_height % _DEVICE_IMAGE_SIZE_STEP
+                cache_key = (src, image_width, image_height)
+                photo = self.device_image_cache.get(cache_key)
+                if photo is not None:
+                    self.device_image_cache.move_to_end(cache_key)
                 else:
                     image_path = self.find_image_path(src)
                     if image_path and os.path.exists(image_path):
-                        pil_image = Image.open(image_path)
-                        pil_image = pil_image.resize((max(1, width - 4), max(1, height - 4)), 
-                                                   Image.Resampling.LANCZOS)
-                        photo = ImageTk.PhotoImage(pil_image)
-                        self.device_image_cache[cache_key] = photo
-                    else:
-                        photo = None
+                        # Decode and resize once per size in the file worker, drawing the placeholder until then
+                        self.load_device_image(cache_key, image_path, widget_id)
                         
                 if photo:
-                    self.device_canvas.create_rectangle(
+                    self._preview_items.create_rectangle(
                         x, y, x + width, y + height,
                         fill='#222222', outline='#555555', width=1,
-                        tags=f"device_widget_{widget_id}"
+                        tags=tag
                     )
-                    self.device_canvas.create_image(
+                    self._preview_items.create_image(
                         x + width//2, y + height//2, image=photo,
-                        tags=f"device_widget_{widget_id}"
+                        tags=tag
                     )
                     return
             except Exception as e:
                 print(f"Error loading image {src}: {e}")
         
         # Placeholder
-        self.device_canvas.create_rectangle(
+        self._preview_items.create_rectangle(
             x, y, x + width, y + height,
             fill='#333333', outline='#666666', width=1,
-            tags=f"device_widget_{widget_id}"
+            tags=tag
         )
         
-    def draw_device_label(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def load_device_image(self, cache_key: tuple, image_path: str, widget_id: str):
+        """Decode a preview image in the background and redraw the widgets showing it once it is ready"""
+        waiting = self._pending_device_images.get(cache_key)
+        if waiting is not None:
+            waiting.add(widget_id)
+            return
+        self._pending_device_images[cache_key] = {widget_id}
+        _, image_width, image_height = cache_key
+        
+        def on_done(pil_image: Any):
+            from PIL import ImageTk
+            widget_ids = self._pending_device_images.pop(cache_key, ())
+            
+            # PhotoImages are Tk objects and have to be created on the Tk thread
+            self.device_image_cache[cache_key] = ImageTk.PhotoImage(pil_image)
+            if len(self.device_image_cache) > _DEVICE_IMAGE_CACHE_SIZE:
+                self.device_image_cache.popitem(last=False)
+                
+            # Their placeholders were drawn from unchanged data, so drop their snapshots to redraw them
+            for waiting_id in widget_ids:
+                self._preview_snapshots.pop(('widget', waiting_id), None)
+            self.update_live_preview()
+            
+        def on_error(error: Exception):
+            self._pending_device_images.pop(cache_key, None)
+            print(f"Error loading image {image_path}: {error}")
+            
+        self.run_in_background(
+            functools.partial(_decode_device_image, image_path, image_width, image_height), on_done, on_error)
+        
+    def draw_device_label(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                          metrics: PreviewMetrics):
         """Draw label widget on device preview"""
+        widget_id = widget_data.get('id', 'label')
+        tag = f"device_widget_{widget_id}"
         text = widget_data.get('text', 'Label')
         text_color = widget_data.get('text_color', '#FFFFFF')
-        font_size = max(8, int(12 * self.preview_scale_var.get()))
-        self.device_canvas.create_text(
+        self._preview_items.create_text(
             x + width//2, y + height//2, text=text,
-            font=('Arial', font_size), fill=text_color,
-            tags=f"device_widget_{widget_data.get('id', 'label')}"
+            font=metrics.font_12, fill=text_color,
+            tags=tag
         )
         
-    def draw_device_bar(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def draw_device_bar(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                        metrics: PreviewMetrics):
         """Draw progress bar on device preview"""
+        widget_id = widget_data.get('id', 'bar')
+        tag = f"device_widget_{widget_id}"
         value = widget_data.get('value', 50)
-        progress_width = (value / 100) * (width - 6)
+        progress_width = (int(value) * (width - 6)) // 100
         
-        self.device_canvas.create_rectangle(
+        self._preview_items.create_rectangle(
             x + 2, y + 2, x + width - 2, y + height - 2,
             fill='#333333', outline='#666666', width=1,
-            tags=f"device_widget_{widget_data.get('id', 'bar')}"
+            tags=tag
         )
         
         if progress_width > 0:
-            self.device_canvas.create_rectangle(
+            self._preview_items.create_rectangle(
                 x + 3, y + 3, x + 3 + progress_width, y + height - 3,
                 fill='#4CAF50', outline='',
-                tags=f"device_widget_{widget_data.get('id', 'bar')}"
+                tags=tag
             )
             
-    def draw_device_arc(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def draw_device_arc(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                        metrics: PreviewMetrics):
         """Draw arc widget on device preview"""
+        widget_id = widget_data.get('id', 'arc')
+        tag = f"device_widget_{widget_id}"
         value = widget_data.get('value', 25)
-        extent = (value / 100) * 270
-        margin = max(4, int(6 * self.preview_scale_var.get()))
+        extent = (int(value) * 270) // 100
+        margin = metrics.arc_margin
         
-        self.device_canvas.create_arc(
+        self._preview_items.create_arc(
             x + margin, y + margin, x + width - margin, y + height - margin,
             start=135, extent=extent, outline='#2196F3',
-            width=max(4, int(8 * self.preview_scale_var.get())), style='arc',
-            tags=f"device_widget_{widget_data.get('id', 'arc')}"
+            width=metrics.arc_width, style='arc',
+            tags=tag
         )
         
-    def draw_device_led(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def draw_device_led(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                        metrics: PreviewMetrics):
         """Draw LED widget on device preview"""
+        widget_id = widget_data.get('id', 'led')
+        tag = f"device_widget_{widget_id}"
         state = widget_data.get('state', True)
         color = widget_data.get('color', '#FF0000') if state else '#330000'
         led_size = min(width - 8, height - 8)
         led_x = x + (width - led_size) // 2
         led_y = y + (height - led_size) // 2
         
-        self.device_canvas.create_oval(
+        self._preview_items.create_oval(
             led_x, led_y, led_x + led_size, led_y + led_size,
             fill=color, outline='#666666', width=1,
-            tags=f"device_widget_{widget_data.get('id', 'led')}"
+            tags=tag
         )
         
-    def draw_device_dropdown(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def draw_device_dropdown(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                             metrics: PreviewMetrics):
         """Draw dropdown widget on device preview"""
+        widget_id = widget_data.get('id', 'dropdown')
+        tag = f"device_widget_{widget_id}"
+        click_tag = tag + "_clickable"
         text = widget_data.get('text', 'Select...')
         
-        self.device_canvas.create_rectangle(
+        self._preview_items.create_rectangle(
             x, y, x + width, y + height,
             fill='#444444', outline='#CCCCCC', width=1,
-            tags=f"device_widget_{widget_data.get('id', 'dropdown')}_clickable"
+            tags=click_tag
         )
         
-        font_size = max(8, int(10 * self.preview_scale_var.get()))
-        self.device_canvas.create_text(
+        self._preview_items.create_text(
             x + 10, y + height//2, text=text,
-            font=('Arial', font_size), fill='#FFFFFF', anchor='w',
-            tags=f"device_widget_{widget_data.get('id', 'dropdown')}"
+            font=metrics.font_10, fill='#FFFFFF', anchor='w',
+            tags=tag
         )
         
-    def draw_device_textarea(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def draw_device_textarea(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                             metrics: PreviewMetrics):
         """Draw textarea widget on device preview"""
+        widget_id = widget_data.get('id', 'textarea')
+        tag = f"device_widget_{widget_id}"
+        click_tag = tag + "_clickable"
         text_content = widget_data.get('text', 'Enter text...')
         
-        self.device_canvas.create_rectangle(
+        self._preview_items.create_rectangle(
             x, y, x + width, y + height,
             fill='#333333', outline='#666666', width=1,
-            tags=f"device_widget_{widget_data.get('id', 'textarea')}_clickable"
+            tags=click_tag
         )
         
         if text_content and height > 20:
-            font_size = max(8, int(10 * self.preview_scale_var.get()))
-            self.device_canvas.create_text(
+            self._preview_items.create_text(
                 x + 8, y + 8, text=text_content[:50] + "..." if len(text_content) > 50 else text_content,
-                font=('Arial', font_size), fill='#FFFFFF', anchor='nw',
-                tags=f"device_widget_{widget_data.get('id', 'textarea')}"
+                font=metrics.font_10, fill='#FFFFFF', anchor='nw',
+                tags=tag
             )
             
-    def draw_device_generic(self, widget_data: dict, x: int, y: int, width: int, height: int):
+    def draw_device_generic(self, widget_data: dict, x: int, y: int, width: int, height: int,
+                            metrics: PreviewMetrics):
         """Draw generic widget on device preview"""
+        widget_id = widget_data.get('id', 'widget')
+        tag = f"device_widget_{widget_id}"
         widget_type = widget_data.get('widget_type', 'widget')
         
-        self.device_canvas.create_rectangle(
+        self._preview_items.create_rectangle(
             x, y, x + width, y + height,
             fill='#424242', outline='#666666', width=1,
-            tags=f"device_widget_{widget_data.get('id', 'widget')}"
+            tags=tag
         )
         
         if height > 20:
-            font_size = max(8, int(10 * self.preview_scale_var.get()))
-            self.device_canvas.create_text(
+            self._preview_items.create_text(
                 x + width//2, y + height//2, text=widget_type.title(),
-                font=('Arial', font_size), fill='#FFFFFF',
-                tags=f"device_widget_{widget_data.get('id', 'widget')}"
+                font=metrics.font_10, fill='#FFFFFF',
+                tags=tag
             )
             
     # Device interaction handlers
@@ -1069,18 +1709,16 @@ class LVGLEditor:
         canvas_y = self.device_canvas.canvasy(event.y)
         
         item = self.device_canvas.find_closest(canvas_x, canvas_y)[0]
-        tags = self.device_canvas.gettags(item)
-        
-        for tag in tags:
-            if '_clickable' in tag:
-                widget_id = tag.replace('device_widget_', '').replace('_clickable', '')
-                self.handle_device_widget_click(widget_id, canvas_x, canvas_y)
-                break
-            elif '_draggable' in tag:
-                widget_id = tag.replace('device_widget_', '').replace('_draggable', '')
-                self.device_state['drag_widget'] = widget_id
-                self.device_state['drag_start'] = (canvas_x, canvas_y)
-                break
+        entry = self._device_item_widgets.get(item)
+        if entry is None:
+            return
+            
+        widget_id, kind = entry
+        if kind == 'clickable':
+            self.handle_device_widget_click(widget_id, canvas_x, canvas_y)
+        else:
+            self.device_state['drag_widget'] = widget_id
+            self.device_state['drag_start'] = (canvas_x, canvas_y)
                 
     def on_device_drag(self, event):
         """Handle device preview dragging"""
@@ -1095,9 +1733,30 @@ class LVGLEditor:
         self.device_state['drag_start'] = None
         
     def on_device_canvas_configure(self, event):
-        """Handle device canvas resize"""
-        pass
-        
+        """Handle device canvas resize once resizing paused, instead of on every pixel"""
+        if self._device_canvas_configure_after is not None:
+            self.root.after_cancel(self._device_canvas_configure_after)
+        self._device_canvas_configure_after = self.root.after(
+            _DEVICE_CANVAS_CONFIGURE_DELAY_MS, self._do_device_canvas_configure)
+        
+    def _do_device_canvas_configure(self):
+        """Run the scheduled device canvas resize handling"""
+        self._device_canvas_configure_after = None
+        
+        # A collapsed preview pane that is opened again
+        self.on_preview_mapped(None)
+        
+    def scroll_device_canvas(self, view: Callable, *args):
+        """Scroll the device canvas and draw the widgets that were left out of the previous viewport"""
+        view(*args)
+        if self._preview_culled:
+            self.update_live_preview()
+            
+    def on_preview_mapped(self, event):
+        """Catch up on preview updates skipped while the preview wasn't visible or widgets outside of its viewport"""
+        if (self._preview_dirty or self._preview_culled) and self.device_canvas.winfo_viewable() and self.device_canvas.winfo_width() > 1:
+            self.update_live_preview()
+            
     def handle_device_widget_click(self, widget_id: str, x: float, y: float):
         """Handle widget clicks in device preview"""
         # Find widget data
@@ -1110,7 +1769,7 @@ class LVGLEditor:
         if widget_type == 'button':
             # Button press animation
             self.device_state['widget_states'][widget_id] = {'pressed': True}
-            self.update_device_preview()
+            self.schedule_device_widget_update(widget_id)
             
             # Release after 100ms
             self.root.after(100, lambda: self.release_button(widget_id))
@@ -1121,12 +1780,12 @@ class LVGLEditor:
         elif widget_type == 'switch':
             current_state = self.device_state['switch_states'].get(widget_id, widget_data.get('state', False))
             self.device_state['switch_states'][widget_id] = not current_state
-            self.update_device_preview()
+            self.schedule_device_widget_update(widget_id)
             
         elif widget_type == 'checkbox':
             current_state = self.device_state['checkbox_states'].get(widget_id, widget_data.get('checked', False))
             self.device_state['checkbox_states'][widget_id] = not current_state
-            self.update_device_preview()
+            self.schedule_device_widget_update(widget_id)
             
     def handle_device_widget_drag(self, widget_id: str, x: float, y: float):
         """Handle widget dragging in device preview"""
@@ -1142,7 +1801,7 @@ class LVGLEditor:
             bezel_thickness = int(20 * scale)
             widget_x = bezel_thickness + int(widget_data.get('x', 0) * scale)
             widget_width = int(widget_data.get('width', 100) * scale)
-            margin = max(8, int(12 * scale))
+            margin = _preview_metrics(scale).slider_margin
             
             relative_x = x - widget_x - margin
             track_width = widget_width - 2 * margin
@@ -1154,7 +1813,7 @@ class LVGLEditor:
                 new_value = min_val + ratio * (max_val - min_val)
                 
                 self.device_state['slider_values'][widget_id] = new_value
-                self.update_device_preview()
+                self.schedule_device_widget_update(widget_id)
                 
     def handle_button_actions(self, widget_data: dict):
         """Handle button actions like page navigation"""
@@ -1167,55 +1826,52 @@ class LVGLEditor:
                     
     def navigate_to_page(self, page_id: str):
         """Navigate to a specific page in device preview"""
-        if hasattr(self, 'page_manager'):
-            pages_data = self.page_manager.get_all_pages()
+        if self.page_manager is not None:
+            pages_data = self.page_manager.get_all_pages_cached()
             if page_id in pages_data:
                 self.device_state['current_page'] = page_id
                 self.current_page_label.config(text=page_id)
-                self.update_device_preview()
+                self.update_live_preview()
                 print(f"Navigated to page: {page_id}")
                 
     def release_button(self, widget_id: str):
         """Release button press state"""
         if widget_id in self.device_state['widget_states']:
             del self.device_state['widget_states'][widget_id]
-        self.update_device_preview()
+        self.schedule_device_widget_update(widget_id)
         
     def find_widget_data_by_id(self, widget_id: str) -> Optional[dict]:
         """Find widget data by ID"""
-        if hasattr(self, 'canvas_editor'):
-            current_page = self.device_state['current_page']
-            widgets = self.canvas_editor.get_widgets_for_page(current_page)
-            for widget_data in widgets:
-                if widget_data.get('id') == widget_id:
-                    return widget_data
+        if self.canvas_editor is not None:
+            ids, _, datas = self.page_draw_lists(self.device_state['current_page'])
+            if widget_id in ids:
+                return datas[ids.index(widget_id)]
         return None
         
     def find_image_path(self, src: str) -> Optional[str]:
         """Find image file path"""
-        if os.path.isabs(src) and os.path.exists(src):
-            return src
-            
-        base_paths = [
-            os.getcwd(),
-            os.path.join(os.getcwd(), 'images'),
-            os.path.join(os.getcwd(), 'assets'),
-            os.path.dirname(os.path.abspath(__file__))
-        ]
-        
-        for base_path in base_paths:
-            test_path = os.path.join(base_path, src)
-            if os.path.exists(test_path):
-                return test_path
-        return None
-        
-    def darken_color(self, color: str, factor: float = 0.7) -> str:
-        """Darken a hex color"""
+        path = _find_image_path(src, self._image_base_paths)
+        if path is not None and not os.path.exists(path):
+            # The file went away since it was found, search again
+            _find_image_path.cache_clear()
+            path = _find_image_path(src, self._image_base_paths)
+        return path
+        
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def darken_color(color: str, factor: float = 0.7) -> str:
+        """Darken a hex color, cached as only a handful of colors get darkened"""
         try:
             if color.startswith('#'):
                 color = color[1:]
-            r, g, b = int(color[:2], 16), int(color[2:4], 16), int(color[4:6], 16)
-            r, g, b = int(r * factor), int(g * factor), int(b * factor)
+            if len(color) < 6:
+                raise ValueError(color)
+                
+            # Channels are taken from the packed 0xRRGGBB value in one parse
+            rgb = int(color[:6], 16)
+            r = int((rgb >> 16) * factor)
+            g = int(((rgb >> 8) & 0xFF) * factor)
+            b = int((rgb & 0xFF) * factor)
             return f"#{r:02x}{g:02x}{b:02x}"
         except:
             return '#333333'
@@ -1224,7 +1880,9 @@ class LVGLEditor:
     def new_project(self):
         """Create a new project"""
         self.current_project = None
-        if self.canvas_editor:
+        self._page_draw_lists.clear()
+        _find_image_path.cache_clear()
+        if self.canvas_editor is not None:
             self.canvas_editor.clear_all()
         
     def open_project(self):
@@ -1234,19 +1892,47 @@ class LVGLEditor:
             filetypes=[("LVGL Project", "*.lvgl"), ("YAML files", "*.yaml"), ("All files", "*.*")]
         )
         if filename:
-            try:
-                with open(filename, 'r') as f:
-                    if filename.endswith('.yaml'):
-                        # Import from ESPHome YAML
-                        self.import_from_yaml(f.read())
-                    else:
-                        # Load LVGL project file
-                        project_data = json.load(f)
-                        self.load_project(project_data)
+            def on_done(data):
+                # Images of the previous project that were missing may exist for this one
+                _find_image_path.cache_clear()
+                if filename.endswith('.yaml'):
+                    # Import from ESPHome YAML
+                    self.import_yaml_data(data)
+                else:
+                    # Load LVGL project file
+                    self.load_project(data)
                 self.current_project = filename
+                
+            def on_error(e):
+                if filename.endswith('.yaml'):
+                    messagebox.showerror("Import Error", f"Failed to import YAML: {str(e)}")
+                else:
+                    messagebox.showerror("Error", f"Failed to open project: {str(e)}")
+                    
+            self.run_in_background(functools.partial(_read_project_file, filename), on_done, on_error)
+            
+    def run_in_background(self, work: Callable[[], Any], on_done: Callable[[Any], None],
+                          on_error: Callable[[Exception], None]):
+        """Run work in the file worker and hand its result to on_done on the Tk thread, errors of either to on_error"""
+        future = self._io_pool.submit(work)
+        
+        def check(future: Future = future):
+            # Tk must only be touched from its own thread, so poll instead of calling back from the worker
+            if not future.done():
+                self.root.after(_IO_POLL_MS, check)
+                return
+            error = future.exception()
+            if error is not None:
+                on_error(error)
+                return
+            try:
+                on_done(future.result())
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to open project: {str(e)}")
+                # Data that parsed but couldn't be used, e.g. a project file of an unexpected shape
+                on_error(e)
                 
+        self.root.after(_IO_POLL_MS, check)
+        
     def save_project(self):
         """Save the current project"""
         if self.current_project:
@@ -1274,12 +1960,23 @@ class LVGLEditor:
                 'widgets': self.canvas_editor.get_widgets_data()
             }
             
-            with open(filename, 'w') as f:
-                json.dump(project_data, f, indent=2)
-                
-            messagebox.showinfo("Success", "Project saved successfully!")
+            # Serialize in one go, json.dump writes every indented chunk separately.
+            # orjson produces the same indented layout as UTF-8 bytes
+            if orjson is not None:
+                content = orjson.dumps(project_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                content = json.dumps(project_data, indent=2)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save project: {str(e)}")
+            return
+            
+        # The project is serialized above, so later edits can't change what gets written
+        self.run_in_background(
+            functools.partial(_write_bytes_file if isinstance(content, bytes) else _write_text_file,
+                              filename, content),
+            lambda _: messagebox.showinfo("Success", "Project saved successfully!"),
+            lambda e: messagebox.showerror("Error", f"Failed to save project: {str(e)}")
+        )
             
     def export_yaml(self):
         """Export the current project as ESPHome YAML"""
@@ -1295,13 +1992,15 @@ class LVGLEditor:
                     self.page_manager.get_pages_data(),
                     self.canvas_editor.get_widgets_data()
                 )
-                
-                with open(filename, 'w') as f:
-                    f.write(yaml_content)
-                    
-                messagebox.showinfo("Success", "YAML exported successfully!")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export YAML: {str(e)}")
+                return
+                
+            self.run_in_background(
+                functools.partial(_write_text_file, filename, yaml_content),
+                lambda _: messagebox.showinfo("Success", "YAML exported successfully!"),
+                lambda e: messagebox.showerror("Error", f"Failed to export YAML: {str(e)}")
+            )
                 
     # Edit operations
     def undo(self):
@@ -1373,13 +2072,27 @@ class LVGLEditor:
             
         # Load widgets
         if 'widgets' in project_data:
-            self.canvas_editor.load_widgets(project_data['widgets'])
+            renamed = self.canvas_editor.load_widgets(project_data['widgets'])
+            self._page_draw_lists.clear()
+            self.report_renamed_widgets(renamed)
             
-    def import_from_yaml(self, yaml_content: str):
-        """Import project from ESPHome YAML"""
+    def report_renamed_widgets(self, renamed: List[Tuple[str, str, str]]):
+        """Tell the user which loaded widgets got a new id, references to their old ids need updating"""
+        if not renamed:
+            return
+        lines = [f"{page_id}: '{old_id}' -> '{new_id}'" if old_id else f"{page_id}: (no ID) -> '{new_id}'"
+                 for page_id, old_id, new_id in renamed[:_RENAMED_WIDGETS_SHOWN]]
+        if len(renamed) > _RENAMED_WIDGETS_SHOWN:
+            lines.append(f"... and {len(renamed) - _RENAMED_WIDGETS_SHOWN} more")
+        messagebox.showwarning(
+            "Widget IDs Changed",
+            "Some widgets had an empty ID or one already used on their page and were given a new ID. "
+            "References to the old IDs need to be updated:\n\n" + "\n".join(lines)
+        )
+        
+    def import_yaml_data(self, yaml_data: dict):
+        """Import project from parsed ESPHome YAML"""
         try:
-            yaml_data = yaml.safe_load(yaml_content)
-            
             # Extract LVGL configuration
             lvgl_config = yaml_data.get('lvgl', {})
             
@@ -1398,6 +2111,7 @@ class LVGLEditor:
             widgets_data = {}
             
             if 'pages' in lvgl_config:
+                convert_widget = self.convert_yaml_widget_to_data
                 for page_config in lvgl_config['pages']:
                     page_id = page_config.get('id', 'page')
                     pages_data[page_id] = {
@@ -1406,24 +2120,22 @@ class LVGLEditor:
                     }
                     
                     # Extract widgets from page
-                    page_widgets = []
-                    if 'widgets' in page_config:
-                        for widget_config in page_config['widgets']:
-                            widget_data = self.convert_yaml_widget_to_data(widget_config)
-                            if widget_data:
-                                page_widgets.append(widget_data)
-                                
-                    widgets_data[page_id] = page_widgets
+                    widgets_data[page_id] = [
+                        widget_data for widget_data in map(convert_widget, page_config.get('widgets', ()))
+                        if widget_data
+                    ]
                     
             # Load the imported data
             if pages_data:
                 self.page_manager.load_pages(pages_data)
             if widgets_data:
-                self.canvas_editor.load_widgets(widgets_data)
+                renamed = self.canvas_editor.load_widgets(widgets_data)
+                self._page_draw_lists.clear()
+                self.report_renamed_widgets(renamed)
                 
             # Update UI
             self.update_project_tree()
-            self.update_device_preview()
+            self.update_live_preview()
             
             messagebox.showinfo("Import Successful", "YAML file imported successfully!")
             
@@ -1435,65 +2147,20 @@ class LVGLEditor:
         widget_type = yaml_widget.get('type', 'obj')
         
         # Map YAML widget types to internal types
-        type_mapping = {
-            'obj': 'label',
-            'label': 'label',
-            'btn': 'button',
-            'slider': 'slider',
-            'switch': 'switch',
-            'checkbox': 'checkbox',
-            'img': 'image',
-            'bar': 'bar',
-            'arc': 'arc',
-            'led': 'led',
-            'dropdown': 'dropdown',
-            'textarea': 'textarea'
-        }
-        
-        internal_type = type_mapping.get(widget_type, 'label')
+        internal_type = _YAML_TYPE_MAP.get(widget_type, 'label')
         
         widget_data = {
             'id': yaml_widget.get('id', f"{internal_type}_1"),
             'widget_type': internal_type,
-            'x': yaml_widget.get('x', 0),
-            'y': yaml_widget.get('y', 0),
-            'width': yaml_widget.get('width', 100),
-            'height': yaml_widget.get('height', 30),
-            'text': yaml_widget.get('text', ''),
-            'bg_color': yaml_widget.get('bg_color', '#FFFFFF'),
-            'text_color': yaml_widget.get('text_color', '#000000'),
+            **_YAML_BASE_DEFAULTS
         }
         
+        # Common properties keep their YAML names, take the ones given over the defaults
+        widget_data.update({key: yaml_widget[key] for key in yaml_widget.keys() & _YAML_BASE_DEFAULTS.keys()})
+        
         # Widget-specific properties
-        if internal_type == 'slider':
-            widget_data.update({
-                'min_value': yaml_widget.get('range_min', 0),
-                'max_value': yaml_widget.get('range_max', 100),
-                'value': yaml_widget.get('value', 50)
-            })
-        elif internal_type == 'image':
-            widget_data['src'] = yaml_widget.get('src', '')
-        elif internal_type == 'switch':
-            widget_data['state'] = yaml_widget.get('state', False)
-        elif internal_type == 'checkbox':
-            widget_data['checked'] = yaml_widget.get('checked', False)
-        elif internal_type == 'bar':
-            widget_data.update({
-                'min_value': yaml_widget.get('range_min', 0),
-                'max_value': yaml_widget.get('range_max', 100),
-                'value': yaml_widget.get('value', 50)
-            })
-        elif internal_type == 'arc':
-            widget_data.update({
-                'min_value': yaml_widget.get('range_min', 0),
-                'max_value': yaml_widget.get('range_max', 100),
-                'value': yaml_widget.get('value', 25)
-            })
-        elif internal_type == 'led':
-            widget_data.update({
-                'state': yaml_widget.get('state', True),
-                'color': yaml_widget.get('color', '#FF0000')
-            })
+        for key, yaml_key, default in _YAML_TYPE_PROPERTIES.get(internal_type, ()):
+            widget_data[key] = yaml_widget.get(yaml_key, default)
             
         return widget_data
         
@@ -1521,6 +2188,9 @@ class LVGLEditor:
     def run(self):
         """Start the application"""
         self.root.mainloop()
+        
+        # Let saves that are still being written finish
+        self._io_pool.shutdown(wait=True)
 
 
 if __name__ == "__main__":
@@ -8,6 +8,8 @@ from tkinter import ttk, messagebox, simpledialog
 from typing import Dict, List, Optional, Callable
 import uuid
 
+from widgets import clone_data
+
 class PageManager:
     """Manages multiple LVGL pages and navigation between them"""
     
@@ -20,6 +22,11 @@ class PageManager:
         self.current_page = None
         self.page_widgets = {}  # page_id -> list of widgets
         
+        # Bumped on every change of the pages, get_all_pages_cached() keys its copy on it
+        self.version = 0
+        self._pages_cache: Optional[Dict] = None
+        self._pages_cache_version = -1
+        
         # UI elements
         self.create_ui()
         
@@ -101,6 +108,7 @@ class PageManager:
         
         self.pages[page_id] = page_info
         self.page_widgets[page_id] = []
+        self.version += 1
         
         # Create tab
         tab_frame = ttk.Frame(self.notebook)
@@ -169,6 +177,7 @@ class PageManager:
         del self.pages[page_id]
         if page_id in self.page_widgets:
             del self.page_widgets[page_id]
+        self.version += 1
             
         # Select another page
         if self.current_page == page_id:
@@ -254,6 +263,7 @@ class PageManager:
             page_info['background_color'] = bg_color_var.get()
             page_info['scrollable'] = scrollable_var.get()
             page_info['scroll_direction'] = scroll_dir_var.get()
+            self.version += 1
             
             # Update tab text
             current_tab = self.notebook.select()
@@ -291,6 +301,7 @@ class PageManager:
         
         if new_name and new_name != current_name:
             self.pages[self.current_page]['name'] = new_name
+            self.version += 1
             
             # Update tab text
             current_tab = self.notebook.select()
@@ -318,10 +329,10 @@ class PageManager:
             'scroll_direction': source_page.get('scroll_direction', 'BOTH'),
             'is_default': False  # Copy is never default
         })
+        self.version += 1
         
         # Copy widgets (deep copy)
-        import copy
-        self.page_widgets[new_page_id] = copy.deepcopy(source_widgets)
+        self.page_widgets[new_page_id] = clone_data(source_widgets)
         
         # Generate new IDs for copied widgets
         def update_widget_ids(widget_data):
@@ -385,6 +396,13 @@ class PageManager:
         """Get all pages data"""
         return self.pages.copy()
         
+    def get_all_pages_cached(self) -> Dict:
+        """Get all pages data, copied only once per change of the pages; the result must not be modified"""
+        if self._pages_cache_version != self.version:
+            self._pages_cache = self.get_all_pages()
+            self._pages_cache_version = self.version
+        return self._pages_cache
+        
     def get_all_widgets_data(self) -> Dict[str, List[Dict]]:
         """Get all widgets data for all pages"""
         return self.page_widgets.copy()
@@ -399,6 +417,7 @@ class PageManager:
         self.pages.clear()
         self.page_widgets.clear()
         self.current_page = None
+        self.version += 1
         
         # Load pages
         if not pages_data:
@@ -410,6 +429,7 @@ class PageManager:
         for page_id, page_info in pages_data.items():
             self.pages[page_id] = page_info
             self.page_widgets[page_id] = widgets_data.get(page_id, [])
+            self.version += 1
             
             # Create tab
             tab_frame = ttk.Frame(self.notebook)
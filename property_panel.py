@@ -3,9 +3,140 @@ Property Panel for editing widget properties
 """
 
 import tkinter as tk
-from tkinter import ttk, colorchooser, filedialog
-from typing import Dict, List, Any, Optional, Callable
-from widgets import LVGLWidget, ALIGN_OPTIONS, COLORS, FONT_OPTIONS
+from tkinter import ttk, colorchooser, filedialog, messagebox
+from typing import Dict, Any, Optional, Callable, Sequence
+from widgets import LVGLWidget, ALIGN_OPTIONS, COLORS, FONT_OPTIONS, SIZE_CONTENT
+
+# Property sections shown for every widget: (title, ((attribute, label, control type), ...))
+_COMMON_SECTIONS = (
+    ("Basic", (
+        ('id', 'ID', 'id'),
+        ('x', 'X Position', 'int'),
+        ('y', 'Y Position', 'int'),
+        ('width', 'Width', 'size'),
+        ('height', 'Height', 'size'),
+        ('align', 'Alignment', 'align'),
+    )),
+    ("Appearance", (
+        ('bg_color', 'Background Color', 'color'),
+        ('bg_opa', 'Background Opacity', 'opacity'),
+        ('border_width', 'Border Width', 'int'),
+        ('border_color', 'Border Color', 'color'),
+        ('border_opa', 'Border Opacity', 'opacity'),
+        ('radius', 'Corner Radius', 'int'),
+    )),
+    ("Padding", (
+        ('pad_all', 'All Sides', 'int'),
+        ('pad_top', 'Top', 'int'),
+        ('pad_bottom', 'Bottom', 'int'),
+        ('pad_left', 'Left', 'int'),
+        ('pad_right', 'Right', 'int'),
+    )),
+    ("Behavior", (
+        ('hidden', 'Hidden', 'bool'),
+        ('clickable', 'Clickable', 'bool'),
+        ('checkable', 'Checkable', 'bool'),
+        ('scrollable', 'Scrollable', 'bool'),
+    )),
+    ("State", (
+        ('checked', 'Checked', 'bool'),
+        ('disabled', 'Disabled', 'bool'),
+    )),
+)
+
+# Additional property sections by widget type
+_VALUE_SECTION = ("Value", (
+    ('value', 'Current Value', 'int'),
+    ('min_value', 'Minimum Value', 'int'),
+    ('max_value', 'Maximum Value', 'int'),
+))
+_WIDGET_SECTIONS = {
+    'label': (
+        ("Text", (
+            ('text', 'Text', 'string'),
+            ('text_color', 'Text Color', 'color'),
+            ('text_font', 'Font', 'font'),
+            ('text_align', 'Text Align', 'string'),
+            ('long_mode', 'Long Mode', 'string'),
+            ('recolor', 'Enable Recolor', 'bool'),
+        )),
+    ),
+    'image': (
+        ("Image", (
+            ('src', 'Source', 'file'),
+            ('angle', 'Rotation Angle', 'int'),
+            ('zoom', 'Zoom Factor', 'string'),
+            ('antialias', 'Anti-alias', 'bool'),
+            ('offset_x', 'X Offset', 'int'),
+            ('offset_y', 'Y Offset', 'int'),
+        )),
+    ),
+    'arc': (
+        _VALUE_SECTION,
+        ("Arc Settings", (
+            ('start_angle', 'Start Angle', 'int'),
+            ('end_angle', 'End Angle', 'int'),
+            ('adjustable', 'User Adjustable', 'bool'),
+            ('arc_color', 'Arc Color', 'color'),
+            ('arc_width', 'Arc Width', 'int'),
+            ('arc_rounded', 'Rounded Ends', 'bool'),
+        )),
+    ),
+    'bar': (
+        _VALUE_SECTION,
+    ),
+    'slider': (
+        _VALUE_SECTION,
+    ),
+    'checkbox': (
+        ("Checkbox", (
+            ('text', 'Label Text', 'string'),
+        )),
+    ),
+    'dropdown': (
+        ("Dropdown", (
+            ('options', 'Options', 'list'),
+            ('selected_index', 'Selected Index', 'int'),
+            ('dir', 'Direction', 'string'),
+        )),
+    ),
+    'textarea': (
+        ("Text Input", (
+            ('text', 'Text', 'string'),
+            ('placeholder_text', 'Placeholder', 'string'),
+            ('one_line', 'Single Line', 'bool'),
+            ('password_mode', 'Password Mode', 'bool'),
+            ('max_length', 'Max Length', 'int'),
+            ('accepted_chars', 'Accepted Chars', 'string'),
+        )),
+    ),
+    'spinbox': (
+        ("Spinbox", (
+            ('value', 'Current Value', 'string'),
+            ('range_from', 'Range From', 'string'),
+            ('range_to', 'Range To', 'string'),
+            ('step', 'Step', 'string'),
+            ('digits', 'Digits', 'int'),
+            ('decimal_places', 'Decimal Places', 'int'),
+            ('rollover', 'Rollover', 'bool'),
+        )),
+    ),
+    'led': (
+        ("LED", (
+            ('color', 'LED Color', 'color'),
+            ('brightness', 'Brightness', 'opacity'),
+        )),
+    ),
+    'qrcode': (
+        ("QR Code", (
+            ('text', 'Text/URL', 'string'),
+            ('size', 'Size', 'int'),
+            ('light_color', 'Light Color', 'color'),
+            ('dark_color', 'Dark Color', 'color'),
+        )),
+    ),
+}
+
 
 class PropertyPanel:
     """Panel for editing widget properties"""
@@ -88,48 +219,9 @@ class PropertyPanel:
         if not self.current_widget:
             return
             
-        # Basic properties section
-        self.create_section("Basic", [
-            ('id', 'ID', 'string'),
-            ('x', 'X Position', 'int'),
-            ('y', 'Y Position', 'int'),
-            ('width', 'Width', 'size'),
-            ('height', 'Height', 'size'),
-            ('align', 'Alignment', 'align'),
-        ])
-        
-        # Style properties section
-        self.create_section("Appearance", [
-            ('bg_color', 'Background Color', 'color'),
-            ('bg_opa', 'Background Opacity', 'opacity'),
-            ('border_width', 'Border Width', 'int'),
-            ('border_color', 'Border Color', 'color'),
-            ('border_opa', 'Border Opacity', 'opacity'),
-            ('radius', 'Corner Radius', 'int'),
-        ])
-        
-        # Padding section
-        self.create_section("Padding", [
-            ('pad_all', 'All Sides', 'int'),
-            ('pad_top', 'Top', 'int'),
-            ('pad_bottom', 'Bottom', 'int'),
-            ('pad_left', 'Left', 'int'),
-            ('pad_right', 'Right', 'int'),
-        ])
-        
-        # Flags section
-        self.create_section("Behavior", [
-            ('hidden', 'Hidden', 'bool'),
-            ('clickable', 'Clickable', 'bool'),
-            ('checkable', 'Checkable', 'bool'),
-            ('scrollable', 'Scrollable', 'bool'),
-        ])
-        
-        # State section
-        self.create_section("State", [
-            ('checked', 'Checked', 'bool'),
-            ('disabled', 'Disabled', 'bool'),
-        ])
+        # Sections shared by all widgets
+        for title, properties in _COMMON_SECTIONS:
+            self.create_section(title, properties)
         
         # Widget-specific properties
         self.create_widget_specific_properties()
@@ -137,7 +229,7 @@ class PropertyPanel:
         # Actions section
         self.create_actions_section()
         
-    def create_section(self, title: str, properties: List[tuple]):
+    def create_section(self, title: str, properties: Sequence[tuple]):
         """Create a property section"""
         # Section frame
         section_frame = ttk.LabelFrame(self.scrollable_frame, text=title, padding=5)
@@ -163,7 +255,15 @@ class PropertyPanel:
         current_value = getattr(self.current_widget, prop_name)
         
         # Create appropriate control based on type
-        if prop_type == 'string':
+        if prop_type == 'id':
+            # Applied when done typing, ids in between may belong to other widgets
+            var = tk.StringVar(value=str(current_value))
+            entry = ttk.Entry(prop_frame, textvariable=var)
+            entry.pack(side=tk.RIGHT, fill=tk.X, expand=True)
+            entry.bind('<Return>', lambda event: self.on_id_property_changed(var))
+            entry.bind('<FocusOut>', lambda event: self.on_id_property_changed(var))
+            
+        elif prop_type == 'string':
             var = tk.StringVar(value=str(current_value))
             entry = ttk.Entry(prop_frame, textvariable=var)
             entry.pack(side=tk.RIGHT, fill=tk.X, expand=True)
@@ -176,7 +276,7 @@ class PropertyPanel:
             var.trace('w', lambda *args: self.on_int_property_changed(prop_name, var.get()))
             
         elif prop_type == 'size':
-            var = tk.StringVar(value=str(current_value))
+            var = tk.StringVar(value="SIZE_CONTENT" if current_value == SIZE_CONTENT else str(current_value))
             frame = ttk.Frame(prop_frame)
             frame.pack(side=tk.RIGHT, fill=tk.X, expand=True)
             
@@ -266,91 +366,8 @@ class PropertyPanel:
         if not self.current_widget:
             return
             
-        widget_type = self.current_widget.widget_type
-        
-        if widget_type == 'label':
-            self.create_section("Text", [
-                ('text', 'Text', 'string'),
-                ('text_color', 'Text Color', 'color'),
-                ('text_font', 'Font', 'font'),
-                ('text_align', 'Text Align', 'string'),
-                ('long_mode', 'Long Mode', 'string'),
-                ('recolor', 'Enable Recolor', 'bool'),
-            ])
-            
-        elif widget_type == 'image':
-            self.create_section("Image", [
-                ('src', 'Source', 'file'),
-                ('angle', 'Rotation Angle', 'int'),
-                ('zoom', 'Zoom Factor', 'string'),
-                ('antialias', 'Anti-alias', 'bool'),
-                ('offset_x', 'X Offset', 'int'),
-                ('offset_y', 'Y Offset', 'int'),
-            ])
-            
-        elif widget_type in ['arc', 'bar', 'slider']:
-            self.create_section("Value", [
-                ('value', 'Current Value', 'int'),
-                ('min_value', 'Minimum Value', 'int'),
-                ('max_value', 'Maximum Value', 'int'),
-            ])
-            
-            if widget_type == 'arc':
-                self.create_section("Arc Settings", [
-                    ('start_angle', 'Start Angle', 'int'),
-                    ('end_angle', 'End Angle', 'int'),
-                    ('adjustable', 'User Adjustable', 'bool'),
-                    ('arc_color', 'Arc Color', 'color'),
-                    ('arc_width', 'Arc Width', 'int'),
-                    ('arc_rounded', 'Rounded Ends', 'bool'),
-                ])
-                
-        elif widget_type == 'checkbox':
-            self.create_section("Checkbox", [
-                ('text', 'Label Text', 'string'),
-            ])
-            
-        elif widget_type == 'dropdown':
-            self.create_section("Dropdown", [
-                ('options', 'Options', 'list'),
-                ('selected_index', 'Selected Index', 'int'),
-                ('dir', 'Direction', 'string'),
-            ])
-            
-        elif widget_type == 'textarea':
-            self.create_section("Text Input", [
-                ('text', 'Text', 'string'),
-                ('placeholder_text', 'Placeholder', 'string'),
-                ('one_line', 'Single Line', 'bool'),
-                ('password_mode', 'Password Mode', 'bool'),
-                ('max_length', 'Max Length', 'int'),
-                ('accepted_chars', 'Accepted Chars', 'string'),
-            ])
-            
-        elif widget_type == 'spinbox':
-            self.create_section("Spinbox", [
-                ('value', 'Current Value', 'string'),
-                ('range_from', 'Range From', 'string'),
-                ('range_to', 'Range To', 'string'),
-                ('step', 'Step', 'string'),
-                ('digits', 'Digits', 'int'),
-                ('decimal_places', 'Decimal Places', 'int'),
-                ('rollover', 'Rollover', 'bool'),
-            ])
-            
-        elif widget_type == 'led':
-            self.create_section("LED", [
-                ('color', 'LED Color', 'color'),
-                ('brightness', 'Brightness', 'opacity'),
-            ])
-            
-        elif widget_type == 'qrcode':
-            self.create_section("QR Code", [
-                ('text', 'Text/URL', 'string'),
-                ('size', 'Size', 'int'),
-                ('light_color', 'Light Color', 'color'),
-                ('dark_color', 'Dark Color', 'color'),
-            ])
+        for title, properties in _WIDGET_SECTIONS.get(self.current_widget.widget_type, ()):
+            self.create_section(title, properties)
             
     def create_actions_section(self):
         """Create actions section for triggers and automations"""
@@ -422,10 +439,26 @@ class PropertyPanel:
         except ValueError:
             pass  # Invalid input, ignore
             
+    def on_id_property_changed(self, var: tk.StringVar):
+        """Handle a finished widget id edit, putting the id back if it was refused"""
+        widget = self.current_widget
+        new_id = var.get()
+        if widget is None or new_id == widget.id:
+            return
+        self.change_callback(widget, 'id', new_id)
+        if widget.id != new_id:
+            # Reset the entry before the dialog takes the focus, which calls this again
+            var.set(widget.id)
+            if new_id:
+                message = f"Another widget on this page already uses the ID '{new_id}'."
+            else:
+                message = "A widget ID can't be empty."
+            messagebox.showwarning("Invalid ID", message)
+            
     def on_size_property_changed(self, prop_name: str, value: str):
         """Handle size property change"""
         if value == "SIZE_CONTENT" or value == "":
-            self.on_property_changed(prop_name, "SIZE_CONTENT")
+            self.on_property_changed(prop_name, SIZE_CONTENT)
         else:
             try:
                 int_value = int(value)
@@ -540,8 +573,9 @@ class ActionEditorDialog:
         # Load current configuration
         if 'then' in self.action_config and self.action_config['then']:
             import yaml
+            from yaml_generator import YAML_DUMPER
             try:
-                yaml_text = yaml.dump(self.action_config['then'], default_flow_style=False)
+                yaml_text = yaml.dump(self.action_config['then'], Dumper=YAML_DUMPER, default_flow_style=False)
                 self.params_text.insert('1.0', yaml_text)
             except:
                 pass
@@ -559,10 +593,11 @@ class ActionEditorDialog:
         """Accept changes"""
         try:
             import yaml
+            from yaml_generator import YAML_LOADER
             yaml_text = self.params_text.get('1.0', tk.END).strip()
             if yaml_text:
                 self.result = {
-                    'then': yaml.safe_load(yaml_text)
+                    'then': yaml.load(yaml_text, Loader=YAML_LOADER)
                 }
             else:
                 self.result = {
@@ -0,0 +1,105 @@
+"""
+Spatial index for hit-testing widgets in the LVGL editor
+"""
+
+import math
+from typing import List, Sequence
+
+# Box list layout of entries and nodes
+_X0, _Y0, _X1, _Y1, _PAYLOAD, _PARENT = range(6)
+
+
+class RTree:
+    """Static R-tree over axis aligned boxes, bulk loaded with Sort-Tile-Recursive packing
+
+    Boxes are given as parallel x, y, width and height lists and identified by
+    their index in them.  Structural changes rebuild the tree, the page
+    geometry it is made from is rebuilt for them anyway.  Moved boxes are
+    updated in place by move(), which only ever grows the node boxes; once
+    more boxes were moved than the tree holds it reports itself as degraded.
+    """
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float],
+                 ws: Sequence[float], hs: Sequence[float], node_size: int = 16):
+        self.node_size = max(2, node_size)
+        self.size = len(xs)
+        self.moves = 0
+
+        # Leaf entries and nodes are [x0, y0, x1, y1, payload, parent] lists,
+        # the payload of an entry is its index, the one of a node its children
+        self._entries = [[x, y, x + w, y + h, i, None] for i, (x, y, w, h) in enumerate(zip(xs, ys, ws, hs))]
+        level = self._entries
+        while len(level) > self.node_size:
+            level = self._pack(level)
+        self._root = self._node(level) if level else None
+
+    def _pack(self, entries: list) -> list:
+        """Group entries into parent nodes, tiled by x then y of their centers"""
+        node_size = self.node_size
+        node_count = math.ceil(len(entries) / node_size)
+        slice_size = node_size * math.ceil(math.sqrt(node_count))
+
+        entries = sorted(entries, key=lambda e: e[_X0] + e[_X1])
+        nodes = []
+        for start in range(0, len(entries), slice_size):
+            tile = sorted(entries[start:start + slice_size], key=lambda e: e[_Y0] + e[_Y1])
+            for child_start in range(0, len(tile), node_size):
+                nodes.append(self._node(tile[child_start:child_start + node_size]))
+        return nodes
+
+    @staticmethod
+    def _node(children: list) -> list:
+        """Create a node covering its children"""
+        x0s, y0s, x1s, y1s = zip(*[child[:4] for child in children])
+        node = [min(x0s), min(y0s), max(x1s), max(y1s), children, None]
+        for child in children:
+            child[_PARENT] = node
+        return node
+
+    @property
+    def degraded(self) -> bool:
+        """Check if moves grew the node boxes enough that a rebuild pays off"""
+        return self.moves > self.size
+
+    def move(self, index: int, x: float, y: float, width: float, height: float):
+        """Update the box of an entry, growing the nodes above it to cover the new box"""
+        entry = self._entries[index]
+        entry[_X0], entry[_Y0], entry[_X1], entry[_Y1] = x, y, x + width, y + height
+        self.moves += 1
+
+        node = entry[_PARENT]
+        while node is not None:
+            if (node[_X0] <= entry[_X0] and node[_Y0] <= entry[_Y0]
+                    and node[_X1] >= entry[_X1] and node[_Y1] >= entry[_Y1]):
+                break
+            node[_X0] = min(node[_X0], entry[_X0])
+            node[_Y0] = min(node[_Y0], entry[_Y0])
+            node[_X1] = max(node[_X1], entry[_X1])
+            node[_Y1] = max(node[_Y1], entry[_Y1])
+            node = node[_PARENT]
+
+    def query_point(self, x: float, y: float) -> List[int]:
+        """Get the indices of all boxes containing a point, in no particular order"""
+        result = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            bx0, by0, bx1, by1, payload, _ = stack.pop()
+            if bx0 <= x <= bx1 and by0 <= y <= by1:
+                if isinstance(payload, list):
+                    stack.extend(payload)
+                else:
+                    result.append(payload)
+        return result
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float) -> List[int]:
+        """Get the indices of all boxes intersecting a rectangle, in no particular order"""
+        result = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            bx0, by0, bx1, by1, payload, _ = stack.pop()
+            if bx0 <= x1 and by0 <= y1 and bx1 >= x0 and by1 >= y0:
+                if isinstance(payload, list):
+                    stack.extend(payload)
+                else:
+                    result.append(payload)
+        return result
@@ -5,7 +5,7 @@ Widget Library for LVGL Editor
 import tkinter as tk
 from tkinter import ttk
 from typing import Dict, List, Any, Callable
-from widgets import LVGL_WIDGETS
+from widgets import LVGL_WIDGETS, WIDGET_INFO
 
 class WidgetLibrary:
     """Widget library panel for selecting widgets to place"""
@@ -185,10 +185,7 @@ class WidgetLibrary:
                     
     def get_widget_info(self, widget_type: str) -> Dict[str, Any]:
         """Get information about a widget type"""
-        for category_widgets in LVGL_WIDGETS.values():
-            if widget_type in category_widgets:
-                return category_widgets[widget_type]
-        return {}
+        return WIDGET_INFO.get(widget_type, {})
         
     def get_selected_widget(self) -> str:
         """Get the currently selected widget type"""
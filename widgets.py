@@ -2,10 +2,25 @@
 LVGL Widget definitions and properties
 """
 
+import copy
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 from enum import Enum
 
+# Size value meaning "size to content" (LVGL SIZE_CONTENT), stored as int
+# so size checks are plain comparisons
+SIZE_CONTENT = -1
+
+
+def clone_data(value: Any) -> Any:
+    """Copy plain data (dicts, lists and scalars), much cheaper than copy.deepcopy"""
+    if isinstance(value, dict):
+        return {key: clone_data(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [clone_data(item) for item in value]
+    return value
+
+
 class WidgetType(Enum):
     """Enumeration of LVGL widget types"""
     LABEL = "label"
@@ -40,8 +55,8 @@ class LVGLWidget:
     id: str = ""
     x: Union[int, str] = 0
     y: Union[int, str] = 0
-    width: Union[int, str] = "SIZE_CONTENT"
-    height: Union[int, str] = "SIZE_CONTENT"
+    width: int = SIZE_CONTENT
+    height: int = SIZE_CONTENT
     
     # Common style properties
     bg_color: str = "0xFFFFFF"
@@ -78,6 +93,17 @@ class LVGLWidget:
     # Actions and triggers
     actions: Dict[str, Any] = field(default_factory=dict)
     
+    def clone(self) -> 'LVGLWidget':
+        """Copy the widget field by field, much cheaper than copy.deepcopy"""
+        clone = copy.copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, list):
+                # Children are widgets, other lists (options) hold plain values
+                setattr(clone, name, [item.clone() if isinstance(item, LVGLWidget) else item for item in value])
+            elif isinstance(value, dict):
+                setattr(clone, name, clone_data(value))
+        return clone
+        
     def to_dict(self) -> Dict[str, Any]:
         """Convert widget to dictionary for YAML export"""
         result = {}
@@ -89,9 +115,9 @@ class LVGLWidget:
             result['x'] = self.x
         if self.y != 0:
             result['y'] = self.y
-        if self.width != "SIZE_CONTENT":
+        if self.width != SIZE_CONTENT:
             result['width'] = self.width
-        if self.height != "SIZE_CONTENT":
+        if self.height != SIZE_CONTENT:
             result['height'] = self.height
             
         # Add styling properties
@@ -188,6 +214,10 @@ class LabelWidget(LVGLWidget):
 class ButtonWidget(LVGLWidget):
     """Button widget"""
     
+    # Display defaults used by the editor canvas (class attributes, not exported)
+    text = "Button"
+    text_color = "#FFFFFF"
+    
     def __post_init__(self):
         self.widget_type = "button"
         self.clickable = True
@@ -315,6 +345,9 @@ class SliderWidget(LVGLWidget):
 class SwitchWidget(LVGLWidget):
     """Switch widget for boolean input"""
     
+    # Display default used by the editor canvas (class attribute, not exported)
+    state = False
+    
     def __post_init__(self):
         self.widget_type = "switch"
         self.checkable = True
@@ -341,6 +374,9 @@ class DropdownWidget(LVGLWidget):
     selected_index: int = 0
     dir: str = "BOTTOM"
     
+    # Display default used by the editor canvas (class attribute, not exported)
+    text = "Select..."
+    
     def __post_init__(self):
         self.widget_type = "dropdown"
         
@@ -419,6 +455,9 @@ class LEDWidget(LVGLWidget):
     color: str = "0xFF0000"
     brightness: str = "100%"
     
+    # Display default used by the editor canvas (class attribute, not exported)
+    state = True
+    
     def __post_init__(self):
         self.widget_type = "led"
         
@@ -469,6 +508,11 @@ def create_widget(widget_type: str, **kwargs) -> LVGLWidget:
         'qrcode': QRCodeWidget,
     }
     
+    # Saved and imported data spell the sentinel as a string
+    for size_key in ('width', 'height'):
+        if kwargs.get(size_key) == "SIZE_CONTENT":
+            kwargs[size_key] = SIZE_CONTENT
+    
     if widget_type in widget_classes:
         return widget_classes[widget_type](widget_type=widget_type, **kwargs)
     else:
@@ -627,6 +671,20 @@ LVGL_WIDGETS = {
     }
 }
 
+# Widget information by widget type, flattened from the LVGL_WIDGETS categories
+WIDGET_INFO: Dict[str, Dict[str, Any]] = {
+    widget_type: info
+    for category in LVGL_WIDGETS.values()
+    for widget_type, info in category.items()
+}
+
+# Default (width, height) used for SIZE_CONTENT by widget type
+DEFAULT_WIDGET_SIZE = (100, 30)
+WIDGET_DEFAULT_SIZES: Dict[str, Tuple[int, int]] = {
+    widget_type: tuple(info.get('default_size', DEFAULT_WIDGET_SIZE))
+    for widget_type, info in WIDGET_INFO.items()
+}
+
 # Alignment options
 ALIGN_OPTIONS = [
     "TOP_LEFT", "TOP_MID", "TOP_RIGHT",
@@ -6,6 +6,10 @@ import yaml
 from typing import Dict, List, Any
 from widgets import LVGLWidget
 
+# Use libyaml's C emitter and parser when PyYAML was built with it
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 class YAMLGenerator:
     """Generate ESPHome YAML configuration from LVGL project"""
     
@@ -43,7 +47,7 @@ class YAMLGenerator:
         config['lvgl'] = self.generate_lvgl_config(display_config, pages_data, widgets_data)
         
         # Convert to YAML
-        yaml_str = yaml.dump(config, default_flow_style=False, indent=self.indentation, sort_keys=False)
+        yaml_str = yaml.dump(config, Dumper=YAML_DUMPER, default_flow_style=False, indent=self.indentation, sort_keys=False)
         
         # Add header comment
         header = """# ESPHome LVGL Configuration
@@ -205,7 +209,7 @@ class YAMLGenerator:
                     automations.append(automation)
                     
         if automations:
-            yaml_str = yaml.dump({'automation': automations}, default_flow_style=False, indent=self.indentation)
+            yaml_str = yaml.dump({'automation': automations}, Dumper=YAML_DUMPER, default_flow_style=False, indent=self.indentation)
             return f"\n# Widget Automations\n{yaml_str}"
         
         return ""
@@ -265,7 +269,7 @@ class YAMLGenerator:
         # Generate style definitions
         style_defs = self.generate_style_definitions(widgets_data)
         if style_defs:
-            styles_yaml = yaml.dump({'style_definitions': style_defs}, default_flow_style=False, indent=self.indentation)
+            styles_yaml = yaml.dump({'style_definitions': style_defs}, Dumper=YAML_DUMPER, default_flow_style=False, indent=self.indentation)
             # Insert styles into main YAML (after lvgl section)
             lines = main_yaml.split('\n')
             lvgl_line = -1